@@ -3,7 +3,14 @@ from datetime import datetime
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from event.models import Event, Registration, Runner, Distance
+from event.models import (
+    Distance,
+    Event,
+    EventDistanceCounter,
+    Registration,
+    Result,
+    Runner,
+)
 
 
 @admin.register(Runner)
@@ -62,11 +69,25 @@ class DistanceAdmin(admin.ModelAdmin):
     list_display = ("km",)
 
 
+class EventDistanceCounterInline(admin.TabularInline):
+    model = EventDistanceCounter
+    fields = ("distance", "capacity", "registration_count")
+    readonly_fields = ("registration_count",)
+    extra = 0
+
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ("start_datetime", "name", "event_type", "location")
+    list_display = (
+        "start_datetime",
+        "name",
+        "event_type",
+        "location",
+        "registration_count",
+    )
     search_fields = ("name",)
     list_filter = ("name", "start_datetime", "event_type")
+    inlines = (EventDistanceCounterInline,)
 
 
 @admin.register(Registration)
@@ -97,3 +118,17 @@ class RegistrationAdmin(admin.ModelAdmin):
         return f"{obj.runner.last_name} {obj.runner.first_name}"
 
     runner.short_description = "Runner"
+
+
+@admin.register(Result)
+class ResultAdmin(admin.ModelAdmin):
+    list_display = ("registration", "net_time", "gun_time")
+    list_select_related = (
+        "registration__event",
+        "registration__runner",
+    )
+    search_fields = (
+        "registration__event__name",
+        "registration__runner__last_name",
+    )
+    raw_id_fields = ("registration",)
@@ -0,0 +1,179 @@
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+
+from django.db.models import Count, FilteredRelation, Max, Q
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+from django.views import generic
+
+from event.models import Distance, Event
+from event.pagination import KeysetPaginator
+
+# Part of every ETag, so changing the JSON layout invalidates client copies.
+API_VERSION = 1
+API_PAGE_SIZE = 50
+
+
+def make_etag(*parts: object) -> str:
+    value = ":".join(str(part) for part in (API_VERSION, *parts))
+    return hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+
+
+def serialize_event(event: Event, distances: list) -> dict:
+    return {
+        "id": event.pk,
+        "url": reverse("event:api_event_detail", kwargs={"pk": event.pk}),
+        "name": event.name,
+        "start_datetime": event.start_datetime,
+        "location": event.location,
+        "event_type": event.event_type,
+        "organiser": event.organiser,
+        "is_active": event.is_active,
+        "registration_count": event.registration_count,
+        "distances": distances,
+        "updated_at": event.updated_at,
+    }
+
+
+def serialize_distances(event: Event) -> list[dict]:
+    distances = (
+        Distance.objects.filter(events=event)
+        .annotate(
+            counter=FilteredRelation(
+                "event_counters", condition=Q(event_counters__event=event)
+            )
+        )
+        .values("km", "counter__registration_count", "counter__capacity")
+        .order_by("km")
+    )
+    return [
+        {
+            "km": distance["km"],
+            "registration_count": distance["counter__registration_count"] or 0,
+            "capacity": distance["counter__capacity"],
+        }
+        for distance in distances
+    ]
+
+
+def conditional_json_response(
+    request: HttpRequest,
+    last_modified: datetime | None,
+    etag: str,
+    get_data: Callable[[], dict],
+) -> HttpResponse:
+    # get_data() only runs when the client's copy is out of date.
+    etag = quote_etag(etag)
+    timestamp = None
+    if last_modified is not None:
+        # updated_at is naive local time (USE_TZ is off).
+        if timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(
+                last_modified, timezone.get_default_timezone()
+            )
+        timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    if response is None:
+        response = JsonResponse(get_data())
+    response.headers["ETag"] = etag
+    if timestamp is not None:
+        response.headers["Last-Modified"] = http_date(timestamp)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+# The API only exposes what event listings already publish (no runner
+# data), so unlike the HTML views it is deliberately open to anonymous
+# clients such as the mobile app and partner sites.
+class EventListAPIView(generic.View):
+    def get(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        last_modified, etag = self.get_validators()
+        return conditional_json_response(
+            request, last_modified, etag, self.get_data
+        )
+
+    def get_queryset(self) -> Event:
+        archived = self.request.GET.get("archived") == "1"
+        queryset = Event.objects.filter(is_active=not archived)
+        event_type = self.request.GET.get("event_type")
+        if event_type:
+            queryset = queryset.filter(event_type=event_type)
+        return queryset
+
+    def get_validators(self) -> tuple[datetime | None, str]:
+        summary = self.get_queryset().aggregate(
+            total=Count("id"), last_modified=Max("updated_at")
+        )
+        query = sorted(self.request.GET.lists())
+        etag = make_etag(
+            "events", summary["total"], summary["last_modified"], query
+        )
+        return summary["last_modified"], etag
+
+    def get_data(self) -> dict:
+        queryset = self.get_queryset().with_cached_distances()
+        page = KeysetPaginator(queryset, API_PAGE_SIZE).page(
+            self.request.GET.get("cursor")
+        )
+        return {
+            "results": [
+                serialize_event(event, event.get_distances())
+                for event in page
+            ],
+            "next": self.get_page_url(page.next_cursor),
+            "previous": self.get_page_url(page.previous_cursor),
+        }
+
+    def get_page_url(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query["cursor"] = cursor
+        return f"{self.request.path}?{query.urlencode()}"
+
+
+class EventDetailAPIView(generic.View):
+    def get(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        last_modified, etag = self.get_validators()
+        return conditional_json_response(
+            request, last_modified, etag, self.get_data
+        )
+
+    def get_object(self) -> Event:
+        if not hasattr(self, "object"):
+            try:
+                self.object = Event.objects.get(pk=self.kwargs["pk"])
+            except Event.DoesNotExist:
+                raise Http404("No event found matching the query")
+        return self.object
+
+    def get_validators(self) -> tuple[datetime | None, str]:
+        event = self.get_object()
+        etag = make_etag("event", event.pk, event.updated_at)
+        return event.updated_at, etag
+
+    def get_data(self) -> dict:
+        event = self.get_object()
+        data = serialize_event(event, serialize_distances(event))
+        data["description"] = event.description
+        return data
+
+
+class EventDistancesAPIView(EventDetailAPIView):
+    def get_validators(self) -> tuple[datetime | None, str]:
+        event = self.get_object()
+        etag = make_etag("distances", event.pk, event.updated_at)
+        return event.updated_at, etag
+
+    def get_data(self) -> dict:
+        return {"results": serialize_distances(self.get_object())}
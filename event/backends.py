@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db import router
+
+from event.cache import get_user_context, set_user_context
+
+
+class CachedModelBackend(ModelBackend):
+    # The cached context is dropped by the Runner save/delete signals, so
+    # a queryset update() (say, of is_active) only reaches signed-in
+    # runners once USER_CONTEXT_CACHE_TIMEOUT expires. Call
+    # invalidate_user_context() after such updates.
+    def get_user(self, user_id: int) -> object | None:
+        context = get_user_context(user_id)
+        if context is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                set_user_context(user_id, self.get_context(user))
+            return user
+
+        user_model = get_user_model()
+        has_registrations = context.pop("has_registrations")
+        session_auth_hash = context.pop("session_auth_hash")
+        # The password stays deferred and is only loaded if it is read.
+        user = user_model.from_db(
+            router.db_for_read(user_model),
+            list(context),
+            list(context.values()),
+        )
+        user.has_registrations = has_registrations
+        user.cached_session_auth_hash = session_auth_hash
+        return user if self.user_can_authenticate(user) else None
+
+    def get_context(self, user: object) -> dict:
+        context = {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        }
+        context["has_registrations"] = user.has_registrations
+        context["session_auth_hash"] = user.get_session_auth_hash()
+        return context
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from asgiref.sync import ThreadSensitiveContext, async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection, connections
+from django.test import AsyncRequestFactory, Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from event.middleware import QueryStats
+from event.models import Event, Registration, Runner
+from event.sqlite import STOCK_PRAGMAS
+from event.urls import app_name, urlpatterns
+from event.views import (
+    ArchiveListView,
+    AsyncArchiveListView,
+    AsyncEventDetailView,
+    AsyncEventListView,
+    EventDetailView,
+    EventListView,
+)
+
+BROWSE_VIEWS = {
+    "index": (EventListView, AsyncEventListView),
+    "event_detail": (EventDetailView, AsyncEventDetailView),
+    "archive_list": (ArchiveListView, AsyncArchiveListView),
+}
+
+
+def get_route_urls(event: Event, registration: Registration) -> dict[str, str]:
+    event_kwargs = {"pk": event.pk}
+    registration_kwargs = {"pk": registration.pk}
+    runner_kwargs = {"pk": registration.runner_id}
+    route_kwargs = {
+        "event_detail": event_kwargs,
+        "event_update": event_kwargs,
+        "event_delete": event_kwargs,
+        "runner_detail": runner_kwargs,
+        "runner_update": runner_kwargs,
+        "runner_delete": runner_kwargs,
+        "registration_list": event_kwargs,
+        "registration_export": {"pk": event.pk, "export_format": "csv"},
+        "registration_create": {"event_id": event.pk},
+        "leaderboard": event_kwargs,
+        "registration_update": registration_kwargs,
+        "registration_delete": registration_kwargs,
+        "api_event_detail": event_kwargs,
+        "api_event_distances": event_kwargs,
+    }
+
+    urls = {}
+    for pattern in urlpatterns:
+        if pattern.name in urls:
+            continue
+        if pattern.pattern.converters and pattern.name not in route_kwargs:
+            raise ImproperlyConfigured(
+                f"No benchmark arguments for route '{pattern.name}'"
+            )
+        urls[pattern.name] = reverse(
+            f"{app_name}:{pattern.name}",
+            kwargs=route_kwargs.get(pattern.name),
+        )
+    return urls
+
+
+def measure(client: Client, url: str, repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        queries = QueryStats()
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            timings.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise ImproperlyConfigured(
+                f"{url} returned {response.status_code}"
+            )
+    return {
+        "latency_ms": round(statistics.median(timings) * 1000, 2),
+        "queries": queries.count,
+    }
+
+
+def get_benchmark_registration() -> Registration:
+    event = Event.objects.order_by("-registration_count", "pk").first()
+    registration = event and event.registrations.order_by("pk").first()
+    if registration is None:
+        raise ImproperlyConfigured("Seed events with registrations first")
+    return registration
+
+
+def run_benchmarks(
+    repeat: int = 5, routes: list[str] | None = None
+) -> dict[str, dict[str, float]]:
+    registration = get_benchmark_registration()
+    event = registration.event
+    client = Client()
+    client.force_login(registration.runner)
+    return {
+        name: measure(client, url, repeat)
+        for name, url in get_route_urls(event, registration).items()
+        if not routes or name in routes
+    }
+
+
+def serve_threads(
+    view: object,
+    url: str,
+    kwargs: dict,
+    user: Runner,
+    concurrency: int,
+    requests: int,
+) -> float:
+    factory = RequestFactory()
+
+    def handle(_: int) -> None:
+        request = factory.get(url)
+        request.user = user
+        try:
+            view(request, **kwargs).render()
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(handle, range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def serve_tasks(
+    view: object,
+    url: str,
+    kwargs: dict,
+    user: Runner,
+    concurrency: int,
+    requests: int,
+) -> float:
+    factory = AsyncRequestFactory()
+
+    async def serve() -> None:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def handle() -> None:
+            # Mirrors ASGIHandler: each request gets its own sync thread.
+            async with slots, ThreadSensitiveContext():
+                request = factory.get(url)
+                request.user = user
+                response = await view(request, **kwargs)
+                await sync_to_async(response.render)()
+                await sync_to_async(connections.close_all)()
+
+        await asyncio.gather(*(handle() for _ in range(requests)))
+
+    started = time.perf_counter()
+    async_to_sync(serve)()
+    return requests / (time.perf_counter() - started)
+
+
+@override_settings(EVENT_LIST_CACHE_TIMEOUT=0)
+def run_concurrency_benchmarks(
+    concurrency: int, requests: int
+) -> dict[str, dict[str, float]]:
+    registration = get_benchmark_registration()
+    results = {}
+    for name, (sync_view, async_view) in BROWSE_VIEWS.items():
+        kwargs = {}
+        if name == "event_detail":
+            kwargs["pk"] = registration.event_id
+        url = reverse(f"{app_name}:{name}", kwargs=kwargs)
+        arguments = (url, kwargs, registration.runner, concurrency, requests)
+        wsgi = serve_threads(sync_view.as_view(), *arguments)
+        asgi = serve_tasks(async_view.as_view(), *arguments)
+        results[name] = {
+            "wsgi_rps": round(wsgi, 1),
+            "asgi_rps": round(asgi, 1),
+        }
+    return results
+
+
+def serve_job(job: tuple[str, str, dict, str]) -> bool:
+    method, url, data, session_key = job
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+    try:
+        getattr(client, method)(url, data)
+    except OperationalError:
+        return False
+    return True
+
+
+def serve_processes(
+    event: Event, runners: list[Runner], readers: int, concurrency: int
+) -> dict[str, float]:
+    register_url = reverse(
+        f"{app_name}:registration_create", kwargs={"event_id": event.pk}
+    )
+    index_url = reverse(f"{app_name}:index")
+    registration = {"distances": event.distances.order_by("km").first().pk}
+    sessions = []
+    for runner in runners:
+        client = Client()
+        client.force_login(runner)
+        sessions.append(client.session.session_key)
+    jobs = [
+        ("post", register_url, registration, session)
+        for session in sessions
+    ]
+    jobs += [("get", index_url, {}, sessions[0])] * readers
+    # Workers are forked like gunicorn's and must not share a connection.
+    connections.close_all()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=concurrency, mp_context=get_context("fork")
+    ) as executor:
+        served = list(executor.map(serve_job, jobs))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": round(len(jobs) / elapsed, 1),
+        "registered": event.registrations.filter(runner__in=runners).count(),
+        "errors": served.count(False),
+    }
+
+
+@override_settings(EVENT_LIST_CACHE_TIMEOUT=0)
+def run_sqlite_benchmarks(
+    concurrency: int, requests: int
+) -> dict[str, dict[str, float]]:
+    if connection.vendor != "sqlite":
+        raise ImproperlyConfigured("The SQLite benchmark needs SQLite")
+    # It registers runners and deletes those registrations again, so only
+    # run it against the throwaway database the benchmark command seeds.
+    settings_dict = connection.settings_dict
+    if settings_dict["NAME"] != settings_dict["TEST"].get("NAME"):
+        raise ImproperlyConfigured(
+            "The SQLite benchmark only runs on a seeded benchmark database"
+        )
+    event = get_benchmark_registration().event
+    runners = list(
+        Runner.objects.filter(is_staff=False)
+        .exclude(registrations__event=event)
+        .order_by("pk")[: requests // 2]
+    )
+    results = {}
+    profiles = {"stock": STOCK_PRAGMAS, "tuned": settings.SQLITE_PRAGMAS}
+    for name, pragmas in profiles.items():
+        # New pragmas only reach new connections.
+        connections.close_all()
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            results[name] = serve_processes(
+                event, runners, requests - len(runners), concurrency
+            )
+        for registration in event.registrations.filter(runner__in=runners):
+            registration.delete()
+    return results
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries "
+                f"(baseline {expected['queries']})"
+            )
+        limit = expected["latency_ms"] * (1 + threshold)
+        if result["latency_ms"] > limit:
+            regressions.append(
+                f"{name}: {result['latency_ms']} ms "
+                f"(baseline {expected['latency_ms']} ms, limit {limit:.2f} ms)"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path: Path, scale: dict, results: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"scale": scale, "routes": results}, indent=2) + "\n",
+        encoding="utf-8",
+    )
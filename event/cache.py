@@ -0,0 +1,189 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from event.routers import reads_from_replica
+
+GENERATION_KEY = "event_list:generation"
+HITS_KEY = "event_list:hits"
+MISSES_KEY = "event_list:misses"
+USER_CONTEXT_KEY = "user_context:{}"
+DISTANCES_VERSION_KEY = "distances:version"
+
+
+def _increment(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _get_stamp(key: str) -> int:
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def _bump_stamp(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def get_generation() -> int:
+    return _get_stamp(GENERATION_KEY)
+
+
+def bump_generation() -> None:
+    _bump_stamp(GENERATION_KEY)
+
+
+def get_distances_version() -> int:
+    return _get_stamp(DISTANCES_VERSION_KEY)
+
+
+def bump_distances_version() -> None:
+    _bump_stamp(DISTANCES_VERSION_KEY)
+    # Workers that reloaded before the commit would keep the old rows.
+    transaction.on_commit(lambda: _bump_stamp(DISTANCES_VERSION_KEY))
+
+
+async def aget_generation() -> int:
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def build_fragment_key(
+    request: HttpRequest, fragment: str, generation: int
+) -> str:
+    query = sorted(request.GET.lists())
+    digest = hashlib.md5(repr(query).encode(), usedforsecurity=False)
+    return ":".join(
+        (
+            "event_list",
+            str(generation),
+            fragment,
+            "staff" if request.user.is_staff else "public",
+            # A lagging replica must not fill the entry a client pinned to
+            # the primary reads after its own write.
+            "replica" if reads_from_replica() else "primary",
+            digest.hexdigest(),
+        )
+    )
+
+
+def get_fragment_key(request: HttpRequest, fragment: str) -> str:
+    return build_fragment_key(request, fragment, get_generation())
+
+
+async def aget_fragment_key(request: HttpRequest, fragment: str) -> str:
+    return build_fragment_key(request, fragment, await aget_generation())
+
+
+def get_fragment(key: str) -> str | None:
+    fragment = cache.get(key)
+    _increment(MISSES_KEY if fragment is None else HITS_KEY)
+    return fragment
+
+
+async def aget_fragment(key: str) -> str | None:
+    fragment = await cache.aget(key)
+    await sync_to_async(_increment)(
+        MISSES_KEY if fragment is None else HITS_KEY
+    )
+    return fragment
+
+
+def set_fragment(key: str, fragment: str) -> None:
+    cache.set(key, fragment, settings.EVENT_LIST_CACHE_TIMEOUT)
+
+
+async def aset_fragment(key: str, fragment: str) -> None:
+    await cache.aset(key, fragment, settings.EVENT_LIST_CACHE_TIMEOUT)
+
+
+def get_cache_stats() -> dict:
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def get_user_context(user_id: int) -> dict | None:
+    return cache.get(USER_CONTEXT_KEY.format(user_id))
+
+
+def set_user_context(user_id: int, context: dict) -> None:
+    cache.set(
+        USER_CONTEXT_KEY.format(user_id),
+        context,
+        settings.USER_CONTEXT_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_user_context(*user_ids: int) -> None:
+    keys = [USER_CONTEXT_KEY.format(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    # A request reading before the commit may have cached the old row.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class FragmentCacheMixin:
+    fragment_template_name = None
+
+    def get(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        self.object_list = self.get_queryset()
+        key = get_fragment_key(request, self.fragment_template_name)
+        fragment = get_fragment(key)
+        if fragment is None:
+            fragment = render_to_string(
+                self.fragment_template_name, self.get_context_data(), request
+            )
+            set_fragment(key, fragment)
+        return self.render_to_response(
+            self.get_page_context_data(fragment=mark_safe(fragment))
+        )
+
+    def get_page_context_data(self, **kwargs: dict) -> dict:
+        return {"view": self, **kwargs}
+
+
+class AsyncFragmentCacheMixin(FragmentCacheMixin):
+    async def get(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        self.object_list = self.get_queryset()
+        key = await aget_fragment_key(request, self.fragment_template_name)
+        fragment = await aget_fragment(key)
+        if fragment is None:
+            await self.apaginate_queryset(
+                self.object_list, self.get_paginate_by(self.object_list)
+            )
+            fragment = render_to_string(
+                self.fragment_template_name, self.get_context_data(), request
+            )
+            await aset_fragment(key, fragment)
+        return self.render_to_response(
+            self.get_page_context_data(fragment=mark_safe(fragment))
+        )
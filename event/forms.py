@@ -1,9 +1,82 @@
+from collections.abc import Iterable, Iterator
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 
 from event.models import Runner, Event, Registration, Distance
 
 
+class DistanceChoiceIterator(ModelChoiceIterator):
+    def __iter__(self) -> Iterator[tuple]:
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for distance in self.field.get_distances():
+            yield self.choice(distance)
+
+    def __len__(self) -> int:
+        has_empty = self.field.empty_label is not None
+        return len(self.field.get_distances()) + has_empty
+
+    def __bool__(self) -> bool:
+        return self.field.empty_label is not None or bool(
+            self.field.get_distances()
+        )
+
+
+class DistanceChoiceMixin:
+    iterator = DistanceChoiceIterator
+
+    def __init__(self, **kwargs: dict) -> None:
+        super().__init__(queryset=Distance.objects.all(), **kwargs)
+        self.distance_ids = None
+
+    def limit_to(self, distances: list[Distance]) -> None:
+        self.distance_ids = {distance.pk for distance in distances}
+        self.queryset = Distance.objects.filter(pk__in=self.distance_ids)
+
+    def get_distances(self, ids: Iterable[int] = ()) -> list[Distance]:
+        if self.distance_ids is None:
+            return list(Distance.objects.get_map(ids).values())
+        distances = Distance.objects.get_map(self.distance_ids)
+        return [
+            distance for distance in distances.values()
+            if distance.pk in self.distance_ids
+        ]
+
+    def get_distance(self, value: object) -> Distance:
+        # A distance added by another worker may be newer than this
+        # process's snapshot, so a miss reloads it once.
+        ids = [int(value)] if str(value).isdigit() else []
+        for distance in self.get_distances(ids):
+            if str(distance.pk) == str(value):
+                return distance
+        raise ValidationError(
+            self.error_messages["invalid_choice"],
+            code="invalid_choice",
+            params={"value": value},
+        )
+
+
+class DistanceChoiceField(DistanceChoiceMixin, forms.ModelChoiceField):
+    def to_python(self, value: object) -> Distance | None:
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Distance):
+            value = value.pk
+        return self.get_distance(value)
+
+
+class DistanceMultipleChoiceField(
+    DistanceChoiceMixin, forms.ModelMultipleChoiceField
+):
+    def _check_values(self, value: list) -> list[Distance]:
+        return [
+            self.get_distance(pk) for pk in dict.fromkeys(map(str, value))
+        ]
+
+
 class RunnerCreationForm(UserCreationForm):
     date_of_birth = forms.DateField(
         widget=forms.DateInput(attrs={"type": "date"}),
@@ -107,25 +180,60 @@ class EventCreationForm(forms.ModelForm):
     location = forms.CharField(
         label="City, street, starting point",
     )
-    distances = forms.ModelMultipleChoiceField(
-        queryset=Distance.objects.all(),
+    distances = DistanceMultipleChoiceField(
         widget=forms.CheckboxSelectMultiple,
         label="Distances",
     )
 
+    # distances is left out of Meta.fields, so the form reads the event's
+    # cached distances instead of loading the relation, and saves them
+    # itself.
+    field_order = ["name", "start_datetime", "location", "distances"]
+
     class Meta:
         model = Event
         fields = [
             "name",
             "start_datetime",
             "location",
-            "distances",
             "description",
             "event_type",
             "organiser",
             "is_active",
         ]
 
+    def __init__(self, *args: tuple, **kwargs: dict) -> None:
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None:
+            self.initial.setdefault(
+                "distances",
+                [
+                    distance.pk
+                    for distance in self.instance.get_cached_distances()
+                ],
+            )
+
+    def save(self, commit: bool = True) -> Event:
+        event = super().save(commit=commit)
+        if commit:
+            self.save_distances()
+        else:
+            save_m2m = self.save_m2m
+
+            def save_all_m2m() -> None:
+                save_m2m()
+                self.save_distances()
+
+            self.save_m2m = save_all_m2m
+        return event
+
+    def save_distances(self) -> None:
+        distances = self.cleaned_data["distances"]
+        self.instance.distances.set(distances)
+        self.instance.cached_distances = sorted(
+            distances, key=lambda distance: distance.km
+        )
+
 
 class EventSearchForm(forms.Form):
     name = forms.CharField(
@@ -142,17 +250,32 @@ class EventSearchForm(forms.Form):
     )
 
 
-class RegistrationForm(forms.ModelForm):
-    distances = forms.ModelChoiceField(
-        queryset=Distance.objects.all(), widget=forms.RadioSelect
+class RunnerSearchForm(forms.Form):
+    name = forms.CharField(
+        max_length=61,
+        required=False,
+        label="",
+        widget=forms.TextInput(attrs={"placeholder": "Last name First name"}),
+    )
+    city = forms.CharField(
+        max_length=30,
+        required=False,
+        label="",
+        widget=forms.TextInput(attrs={"placeholder": "City"}),
     )
 
+
+class RegistrationForm(forms.ModelForm):
+    distances = DistanceChoiceField(widget=forms.RadioSelect)
+
     def __init__(self, *args: tuple, **kwargs: dict) -> None:
+        event = kwargs.pop("event", None)
         event_id = kwargs.pop("event_id", None)
         super().__init__(*args, **kwargs)
-        if event_id:
-            event = Event.objects.get(id=event_id)
-            self.fields["distances"].queryset = event.distances.all()
+        if event is None and event_id:
+            event = Event.objects.with_cached_distances().get(id=event_id)
+        if event is not None:
+            self.fields["distances"].limit_to(event.get_cached_distances())
 
     class Meta:
         model = Registration
@@ -0,0 +1,36 @@
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpRequest
+
+from event.models import Event
+
+
+class IdentityMap:
+    def __init__(self) -> None:
+        self.objects = {}
+
+    def get_key(self, model: type[Model], pk: object) -> tuple[str, str]:
+        return model._meta.label, str(pk)
+
+    def get(self, queryset: QuerySet, pk: object) -> Model:
+        key = self.get_key(queryset.model, pk)
+        if key not in self.objects:
+            self.objects[key] = queryset.get(pk=pk)
+        return self.objects[key]
+
+    def add(self, obj: Model) -> Model:
+        return self.objects.setdefault(self.get_key(type(obj), obj.pk), obj)
+
+
+def get_identity_map(request: HttpRequest) -> IdentityMap:
+    if not hasattr(request, "identity_map"):
+        request.identity_map = IdentityMap()
+    return request.identity_map
+
+
+def get_event(request: HttpRequest, event_id: object) -> Event:
+    try:
+        return get_identity_map(request).get(
+            Event.objects.with_cached_distances(), event_id
+        )
+    except (Event.DoesNotExist, ValueError):
+        raise Http404("No event found matching the query")
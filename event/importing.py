@@ -0,0 +1,66 @@
+import csv
+import json
+import math
+from collections.abc import Iterator
+
+FORMATS = ("csv", "jsonl")
+
+
+def read_csv(source: Iterator[str]) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(source)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(source: Iterator[str]) -> Iterator[tuple[int, dict]]:
+    for line, text in enumerate(source, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError as error:
+            row = {"error": f"invalid JSON ({error.msg})"}
+        if not isinstance(row, dict):
+            row = {"error": "expected a JSON object"}
+        yield line, row
+
+
+def read_rows(
+    source: Iterator[str], file_format: str
+) -> Iterator[tuple[int, dict]]:
+    if file_format == "csv":
+        return read_csv(source)
+    return read_jsonl(source)
+
+
+def read_batches(
+    rows: Iterator[tuple[int, dict]], size: int
+) -> Iterator[list[tuple[int, dict]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_seconds(value: object) -> float:
+    # Chip timing exports use "H:MM:SS.ff"; JSON files may send seconds.
+    # Splitting by hand is several times faster than parse_duration().
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        parts = [float(value)]
+    else:
+        try:
+            parts = [float(part) for part in str(value).split(":")]
+        except ValueError:
+            parts = []
+    if not 0 < len(parts) <= 3 or min(parts) < 0:
+        raise ValueError(f"invalid time '{value}'")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    if not 0 < seconds < math.inf:
+        raise ValueError(f"invalid time '{value}'")
+    return seconds
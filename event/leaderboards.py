@@ -0,0 +1,178 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+from event.models import Leaderboard, LeaderboardEntry, Registration
+
+OVERALL = ("", "")
+
+
+def board_keys(gender: str, age_category: str | None) -> list[tuple]:
+    keys = [OVERALL]
+    if gender:
+        keys.append((gender, ""))
+        if age_category:
+            keys.append((gender, age_category))
+    return keys
+
+
+def ranked_finishers(
+    event_id: int, distance_id: int | None = None
+) -> Registration:
+    finishers = Registration.objects.filter(
+        event_id=event_id, result__isnull=False
+    )
+    if distance_id is not None:
+        finishers = finishers.filter(distances_id=distance_id)
+    by_time = F("result__net_time").asc()
+    return (
+        finishers.with_age()
+        .annotate(
+            overall_rank=Window(
+                Rank(), partition_by=[F("distances")], order_by=by_time
+            ),
+            gender_rank=Window(
+                Rank(),
+                partition_by=[F("distances"), F("runner__gender")],
+                order_by=by_time,
+            ),
+            category_rank=Window(
+                Rank(),
+                partition_by=[F("distances"), F("age_category")],
+                order_by=by_time,
+            ),
+        )
+        .values_list(
+            "id",
+            "distances_id",
+            "runner__gender",
+            "age_category",
+            "result__net_time",
+            "overall_rank",
+            "gender_rank",
+            "category_rank",
+        )
+    )
+
+
+def rebuild_leaderboards(
+    event_id: int, distance_id: int | None = None
+) -> int:
+    rows = list(ranked_finishers(event_id, distance_id))
+    sizes = Counter()
+    for _, distance, gender, category, *_ in rows:
+        for key in board_keys(gender, category):
+            sizes[(distance, *key)] += 1
+
+    with transaction.atomic():
+        boards = Leaderboard.objects.filter(event_id=event_id)
+        if distance_id is not None:
+            boards = boards.filter(distance_id=distance_id)
+        boards.delete()
+        boards = Leaderboard.objects.bulk_create(
+            Leaderboard(
+                event_id=event_id,
+                distance_id=distance,
+                gender=gender,
+                age_category=category,
+                size=size,
+            )
+            for (distance, gender, category), size in sizes.items()
+        )
+        board_ids = {
+            (board.distance_id, board.gender, board.age_category): board.pk
+            for board in boards
+        }
+        entries = []
+        for pk, distance, gender, category, net_time, *ranks in rows:
+            keys = board_keys(gender, category)
+            for key, rank in zip(keys, ranks):
+                entries.append(
+                    LeaderboardEntry(
+                        leaderboard_id=board_ids[(distance, *key)],
+                        registration_id=pk,
+                        net_time=net_time,
+                        rank=rank,
+                    )
+                )
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=5000)
+    return len(rows)
+
+
+def add_to_leaderboards(registration_id: int) -> None:
+    finisher = (
+        Registration.objects.filter(pk=registration_id, result__isnull=False)
+        .with_age()
+        .values(
+            "event_id",
+            "distances_id",
+            "runner__gender",
+            "age_category",
+            "result__net_time",
+        )
+        .first()
+    )
+    if finisher is None:
+        return
+    net_time = finisher["result__net_time"]
+    keys = board_keys(finisher["runner__gender"], finisher["age_category"])
+    with transaction.atomic():
+        for gender, category in keys:
+            board, _ = Leaderboard.objects.select_for_update().get_or_create(
+                event_id=finisher["event_id"],
+                distance_id=finisher["distances_id"],
+                gender=gender,
+                age_category=category,
+            )
+            entries = LeaderboardEntry.objects.filter(leaderboard=board)
+            faster = entries.filter(net_time__lt=net_time).count()
+            entries.filter(net_time__gt=net_time).update(rank=F("rank") + 1)
+            LeaderboardEntry.objects.create(
+                leaderboard=board,
+                registration_id=registration_id,
+                net_time=net_time,
+                rank=faster + 1,
+            )
+            Leaderboard.objects.filter(pk=board.pk).update(size=F("size") + 1)
+
+
+def remove_from_leaderboards(registration_id: int) -> None:
+    with transaction.atomic():
+        entries = LeaderboardEntry.objects.filter(
+            registration_id=registration_id
+        )
+        list(
+            Leaderboard.objects.select_for_update().filter(
+                entries__registration_id=registration_id
+            )
+        )
+        for entry in entries:
+            LeaderboardEntry.objects.filter(
+                leaderboard_id=entry.leaderboard_id,
+                net_time__gt=entry.net_time,
+            ).update(rank=F("rank") - 1)
+            Leaderboard.objects.filter(pk=entry.leaderboard_id).update(
+                size=F("size") - 1
+            )
+        entries.delete()
+
+
+def update_leaderboards(
+    registration_id: int, net_time: timedelta | None = None
+) -> None:
+    # Ranks only move when the finish time does; pass no time to re-rank a
+    # registration whose distance or runner details changed.
+    if net_time is not None:
+        times = set(
+            LeaderboardEntry.objects.filter(
+                registration_id=registration_id
+            ).values_list("net_time", flat=True)
+        )
+        if times == {net_time}:
+            return
+    with transaction.atomic():
+        remove_from_leaderboards(registration_id)
+        add_to_leaderboards(registration_id)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from django.utils import timezone
+
+from event.cache import bump_generation
+from event.models import Event
+
+
+def refresh_event_statuses(now: datetime | None = None) -> tuple[int, int]:
+    now = now or timezone.now()
+    archived = Event.objects.filter(
+        is_active=True, start_datetime__lte=now
+    ).update(is_active=False, updated_at=now)
+    reactivated = Event.objects.filter(
+        is_active=False, start_datetime__gt=now
+    ).update(is_active=True, updated_at=now)
+    if archived or reactivated:
+        bump_generation()
+    return archived, reactivated
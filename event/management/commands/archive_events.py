@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from event.lifecycle import refresh_event_statuses
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Archive events whose start time has passed and reactivate "
+        "rescheduled ones. Runs once, or forever with --interval."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Seconds between runs; 0 runs a single pass and exits.",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        interval = options["interval"]
+        while True:
+            archived, reactivated = refresh_event_statuses()
+            self.stdout.write(
+                f"Archived {archived} event(s), "
+                f"reactivated {reactivated} event(s)."
+            )
+            if interval <= 0:
+                return
+            time.sleep(interval)
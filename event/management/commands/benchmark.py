@@ -0,0 +1,176 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from event.benchmark import (
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    run_concurrency_benchmarks,
+    run_sqlite_benchmarks,
+    save_baseline,
+)
+from event.models import Event
+from event.seeding import seed_data
+
+BENCHMARK_DIR = Path(settings.BASE_DIR) / "benchmarks"
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Seed a throwaway database and measure latency and query count "
+        "for every route in event/urls.py against a stored baseline."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--runners", type=int, default=200_000)
+        parser.add_argument("--events", type=int, default=10_000)
+        parser.add_argument("--registrations", type=int, default=2_000_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help="Only benchmark this route name; may be repeated.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed latency growth over the baseline (0.25 = 25%%).",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=BENCHMARK_DIR / "baseline.json",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store these results as the new baseline.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=0,
+            help=(
+                "Also compare WSGI threads with ASGI tasks for the event "
+                "browsing views at this many concurrent requests."
+            ),
+        )
+        parser.add_argument(
+            "--sqlite-concurrency",
+            type=int,
+            default=0,
+            help=(
+                "Also compare stock and tuned SQLite pragmas with this many "
+                "forked worker processes registering runners and browsing "
+                "events at once. The registrations are made in, and then "
+                "deleted from, the seeded benchmark database."
+            ),
+        )
+        parser.add_argument("--concurrent-requests", type=int, default=200)
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the seeded database between runs.",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        scale = {
+            "runners": options["runners"],
+            "events": options["events"],
+            "registrations": options["registrations"],
+            "seed": options["seed"],
+        }
+        baseline = load_baseline(options["baseline"])
+        rescaled = baseline and baseline["scale"] != scale
+        if rescaled and not options["update_baseline"]:
+            raise CommandError(
+                f"The baseline was recorded at {baseline['scale']}; rerun "
+                f"with the same scale or pass --update-baseline."
+            )
+
+        results = self.benchmark(scale, options)
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24} {result['latency_ms']:>10.2f} ms "
+                f"{result['queries']:>5} queries"
+            )
+
+        if options["update_baseline"]:
+            if baseline and not rescaled:
+                results = {**baseline["routes"], **results}
+            save_baseline(options["baseline"], scale, results)
+            self.stdout.write(f"Baseline written to {options['baseline']}")
+            return
+
+        regressions = find_regressions(
+            results, baseline.get("routes", {}), options["threshold"]
+        )
+        if regressions:
+            raise CommandError(
+                "Performance regressions:\n" + "\n".join(regressions)
+            )
+        self.stdout.write("No regressions against the baseline.")
+
+    def benchmark(self, scale: dict, options: dict) -> dict:
+        old_name = connection.settings_dict["NAME"]
+        # Never share a database with the test suite.
+        if connection.vendor == "sqlite":
+            benchmark_name = str(BENCHMARK_DIR / "benchmark.sqlite3")
+        else:
+            benchmark_name = f"benchmark_{old_name}"
+        connection.settings_dict["TEST"]["NAME"] = benchmark_name
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        setup_test_environment()
+        try:
+            if not Event.objects.exists():
+                summary = seed_data(
+                    **scale, progress=lambda line: self.stdout.write(line)
+                )
+                self.stdout.write(f"Seeded {summary}")
+            if options["concurrency"]:
+                self.compare_servers(options)
+            if options["sqlite_concurrency"]:
+                self.compare_sqlite(options)
+            return run_benchmarks(options["repeat"], options["routes"])
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+
+    def compare_servers(self, options: dict) -> None:
+        results = run_concurrency_benchmarks(
+            options["concurrency"], options["concurrent_requests"]
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24} WSGI {result['wsgi_rps']:>8.1f} req/s "
+                f"ASGI {result['asgi_rps']:>8.1f} req/s"
+            )
+
+    def compare_sqlite(self, options: dict) -> None:
+        results = run_sqlite_benchmarks(
+            options["sqlite_concurrency"], options["concurrent_requests"]
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"sqlite {name:<17} {result['rps']:>8.1f} req/s "
+                f"{result['registered']:>5} registered "
+                f"{result['errors']:>5} locked"
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from event.cache import get_cache_stats
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Show hit/miss statistics of the event list fragment cache."
+    )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
@@ -0,0 +1,134 @@
+from collections import Counter
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import IntegrityError, transaction
+
+from event.cache import bump_generation, invalidate_user_context
+from event.importing import FORMATS, read_batches, read_rows
+from event.models import Event, EventDistanceCounter, Registration, Runner
+from event.stats import rebuild_runner_stats
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Stream registrations for one event from a CSV or JSONL file with "
+        "'username' and 'distance' (km) columns."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("event_id", type=int)
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format; guessed from the extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        try:
+            self.event = Event.objects.get(pk=options["event_id"])
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event_id']} does not exist")
+        self.distance_ids = dict(
+            self.event.distances.values_list("km", "id")
+        )
+        self.imported = 0
+        self.failed = 0
+
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in FORMATS:
+            raise CommandError("Use --format to choose csv or jsonl")
+
+        with path.open(newline="", encoding="utf-8") as source:
+            rows = read_rows(source, file_format)
+            for batch in read_batches(rows, options["batch_size"]):
+                self.import_batch(batch)
+        if self.imported:
+            bump_generation()
+
+        self.stdout.write(
+            f"Imported {self.imported} registration(s), "
+            f"{self.failed} row(s) failed."
+        )
+
+    def report(self, line: int, message: str) -> None:
+        self.failed += 1
+        self.stderr.write(f"Line {line}: {message}")
+
+    def import_batch(self, batch: list[tuple[int, dict]]) -> None:
+        usernames = {str(row.get("username", "")).strip() for _, row in batch}
+        runner_ids = dict(
+            Runner.objects.filter(username__in=usernames).values_list(
+                "username", "id"
+            )
+        )
+        registered = set(
+            Registration.objects.filter(
+                event=self.event, runner_id__in=runner_ids.values()
+            ).values_list("runner_id", flat=True)
+        )
+
+        pending = []
+        for line, row in batch:
+            if "error" in row:
+                self.report(line, row["error"])
+                continue
+            username = str(row.get("username", "")).strip()
+            runner_id = runner_ids.get(username)
+            if runner_id is None:
+                self.report(line, f"unknown runner '{username}'")
+                continue
+            try:
+                distance_id = self.distance_ids[int(row.get("distance"))]
+            except (KeyError, TypeError, ValueError):
+                self.report(
+                    line,
+                    f"distance '{row.get('distance')}' is not offered "
+                    f"by this event",
+                )
+                continue
+            if runner_id in registered:
+                self.report(line, f"'{username}' is already registered")
+                continue
+            registered.add(runner_id)
+            pending.append(
+                (
+                    line,
+                    Registration(
+                        event=self.event,
+                        runner_id=runner_id,
+                        distances_id=distance_id,
+                    ),
+                )
+            )
+
+        try:
+            self.save_registrations([obj for _, obj in pending])
+        except (IntegrityError, ValidationError):
+            for line, registration in pending:
+                try:
+                    self.save_registrations([registration])
+                except IntegrityError:
+                    self.report(line, "conflicts with an existing record")
+                except ValidationError as error:
+                    self.report(line, error.messages[0])
+
+    def save_registrations(self, registrations: list[Registration]) -> None:
+        if not registrations:
+            return
+        with transaction.atomic():
+            Registration.objects.bulk_create(registrations)
+            tally = Counter(obj.distances_id for obj in registrations)
+            for distance_id, count in tally.items():
+                EventDistanceCounter.adjust(self.event.pk, distance_id, count)
+            rebuild_runner_stats([obj.runner_id for obj in registrations])
+        invalidate_user_context(*(obj.runner_id for obj in registrations))
+        self.imported += len(registrations)
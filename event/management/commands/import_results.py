@@ -0,0 +1,124 @@
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from event.importing import FORMATS, parse_seconds, read_batches, read_rows
+from event.leaderboards import rebuild_leaderboards
+from event.models import Event, Registration, Result
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Stream chip-timing results for one event from a CSV or JSONL file "
+        "with 'username', 'gun_time' and 'net_time' columns. CSV columns "
+        "named 'split_<name>' (or a JSON 'splits' object) hold the splits. "
+        "Importing a runner again replaces their result."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("event_id", type=int)
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format; guessed from the extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        try:
+            self.event = Event.objects.get(pk=options["event_id"])
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event_id']} does not exist")
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in FORMATS:
+            raise CommandError("Use --format to choose csv or jsonl")
+
+        # One query up front instead of a lookup per row or per batch.
+        self.registration_ids = dict(
+            Registration.objects.filter(event=self.event).values_list(
+                "runner__username", "id"
+            )
+        )
+        self.seen = set()
+        self.imported = 0
+        self.failed = 0
+
+        with path.open(newline="", encoding="utf-8") as source:
+            rows = read_rows(source, file_format)
+            for batch in read_batches(rows, options["batch_size"]):
+                self.import_batch(batch)
+
+        if self.imported:
+            rebuild_leaderboards(self.event.pk)
+
+        self.stdout.write(
+            f"Imported {self.imported} result(s), "
+            f"{self.failed} row(s) failed."
+        )
+
+    def report(self, line: int, message: str) -> None:
+        self.failed += 1
+        self.stderr.write(f"Line {line}: {message}")
+
+    def import_batch(self, batch: list[tuple[int, dict]]) -> None:
+        results = []
+        for line, row in batch:
+            if "error" in row:
+                self.report(line, row["error"])
+                continue
+            username = str(row.get("username", "")).strip()
+            registration_id = self.registration_ids.get(username)
+            if registration_id is None:
+                self.report(
+                    line, f"'{username}' is not registered for this event"
+                )
+                continue
+            if registration_id in self.seen:
+                self.report(line, f"duplicate result for '{username}'")
+                continue
+            try:
+                result = Result(
+                    registration_id=registration_id,
+                    gun_time=timedelta(
+                        seconds=parse_seconds(row.get("gun_time"))
+                    ),
+                    net_time=timedelta(
+                        seconds=parse_seconds(row.get("net_time"))
+                    ),
+                    splits=self.parse_splits(row),
+                )
+            except ValueError as error:
+                self.report(line, str(error))
+                continue
+            self.seen.add(registration_id)
+            results.append(result)
+
+        Result.objects.bulk_create(
+            results,
+            update_conflicts=True,
+            unique_fields=["registration"],
+            update_fields=["gun_time", "net_time", "splits", "imported_at"],
+        )
+        self.imported += len(results)
+
+    def parse_splits(self, row: dict) -> dict[str, float]:
+        splits = row.get("splits")
+        if splits is None:
+            splits = {
+                key.removeprefix("split_"): value
+                for key, value in row.items()
+                if key and key.startswith("split_") and value not in ("", None)
+            }
+        if not isinstance(splits, dict):
+            raise ValueError("splits must be an object")
+        return {
+            str(name): parse_seconds(value)
+            for name, value in splits.items()
+        }
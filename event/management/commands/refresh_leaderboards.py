@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from event.leaderboards import rebuild_leaderboards
+from event.models import Event
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Rebuild the leaderboards of the given events, or of every event "
+        "with results. Result changes keep them current on their own; run "
+        "this after runners change their gender or date of birth."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("event_ids", nargs="*", type=int)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        events = Event.objects.filter(
+            registrations__result__isnull=False
+        ).distinct()
+        if options["event_ids"]:
+            events = events.filter(pk__in=options["event_ids"])
+        for event_id in events.values_list("pk", flat=True):
+            ranked = rebuild_leaderboards(event_id)
+            self.stdout.write(f"Event {event_id}: ranked {ranked} result(s).")
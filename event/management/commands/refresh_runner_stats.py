@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from event.stats import rebuild_runner_stats
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Recount the activity statistics of the given runners, or of every "
+        "runner. Registration and event changes keep them current on their "
+        "own; run this after changing a distance's length."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("runner_ids", nargs="*", type=int)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        summarised = rebuild_runner_stats(options["runner_ids"] or None)
+        self.stdout.write(f"Summarised {summarised} runner(s).")
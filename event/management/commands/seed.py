@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from event.models import Runner
+from event.seeding import SEED_PASSWORD, seed_data
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Generate deterministic runners, distances, events and "
+        "registrations for local performance work."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--runners", type=int, default=20_000)
+        parser.add_argument("--events", type=int, default=1_000)
+        parser.add_argument("--registrations", type=int, default=200_000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="The same seed always generates the same data.",
+        )
+        parser.add_argument(
+            "--now",
+            type=datetime.fromisoformat,
+            help=(
+                "Date and time event dates are spread around (ISO format); "
+                "the current hour by default, so pass it for identical data."
+            ),
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        seed = options["seed"]
+        if Runner.objects.filter(username__startswith=f"seed{seed}-").exists():
+            raise CommandError(
+                f"Data for seed {seed} already exists; use another --seed."
+            )
+        if options["registrations"] and not options["events"]:
+            raise CommandError("Registrations need at least one event.")
+
+        summary = seed_data(
+            runners=options["runners"],
+            events=options["events"],
+            registrations=options["registrations"],
+            seed=seed,
+            batch_size=options["batch_size"],
+            now=options["now"],
+            progress=(
+                self.stdout.write if options["verbosity"] > 1 else None
+            ),
+        )
+        self.stdout.write(
+            f"Seeded {summary['runners']} runner(s), {summary['events']} "
+            f"event(s) and {summary['registrations']} registration(s). "
+            f"Seeded runners log in as seed{seed}-runner<N> with password "
+            f"'{SEED_PASSWORD}'."
+        )
@@ -0,0 +1,118 @@
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from event.cache import get_cache_stats
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(
+        self, name: str, description: str, buckets: tuple[float, ...]
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, view: str, value: float) -> None:
+        with self.lock:
+            counts, total = self.series.get(
+                view, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self.series[view] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self.lock:
+            series = {
+                view: (list(counts), total)
+                for view, (counts, total) in self.series.items()
+            }
+        for view, (counts, total) in sorted(series.items()):
+            label = view.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{view="{label}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            cumulative += counts[-1]
+            lines.append(
+                f'{self.name}_bucket{{view="{label}",le="+Inf"}} {cumulative}'
+            )
+            lines.append(f'{self.name}_sum{{view="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{label}"}} {cumulative}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Total time spent handling the request.",
+    LATENCY_BUCKETS,
+)
+QUERY_COUNT = Histogram(
+    "db_queries_per_request",
+    "Number of SQL queries executed per request.",
+    QUERY_COUNT_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Total SQL execution time per request.",
+    LATENCY_BUCKETS,
+)
+RENDER_DURATION = Histogram(
+    "template_render_duration_seconds",
+    "Time spent rendering the response template.",
+    LATENCY_BUCKETS,
+)
+HISTOGRAMS = (REQUEST_DURATION, QUERY_COUNT, QUERY_DURATION, RENDER_DURATION)
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    stats = get_cache_stats()
+    lines += [
+        "# HELP event_list_cache_hits_total Event list fragment cache hits.",
+        "# TYPE event_list_cache_hits_total counter",
+        f"event_list_cache_hits_total {stats['hits']}",
+        "# HELP event_list_cache_misses_total "
+        "Event list fragment cache misses.",
+        "# TYPE event_list_cache_misses_total counter",
+        f"event_list_cache_misses_total {stats['misses']}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def has_metrics_access(request: HttpRequest) -> bool:
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return True
+    return request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    if not has_metrics_access(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4"
+    )
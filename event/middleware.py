@@ -0,0 +1,146 @@
+from collections.abc import Callable
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import connections
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from event import metrics
+from event.routers import SAFE_METHODS, pin_to_primary
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: tuple,
+        many: bool,
+        context: dict,
+    ) -> object:
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = perf_counter()
+        queries = QueryStats()
+        request._render_duration = 0.0
+        with self.wrap_connections(queries):
+            response = self.get_response(request)
+        self.observe(request, perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = perf_counter()
+        queries = QueryStats()
+        request._render_duration = 0.0
+        # Sync code for one ASGI request, including the async ORM, runs in
+        # a single thread with its own connections, so wrap those.
+        wrappers = await sync_to_async(self.wrap_connections)(queries)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        self.observe(request, perf_counter() - start, queries)
+        return response
+
+    def wrap_connections(self, queries: QueryStats) -> ExitStack:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            return stack.pop_all()
+
+    def observe(
+        self, request: HttpRequest, duration: float, queries: QueryStats
+    ) -> None:
+        match = request.resolver_match
+        if match is not None and match.func is metrics.metrics_view:
+            return
+        view = match.view_name if match is not None else "unresolved"
+        metrics.REQUEST_DURATION.observe(view, duration)
+        metrics.QUERY_COUNT.observe(view, queries.count)
+        metrics.QUERY_DURATION.observe(view, queries.duration)
+        metrics.RENDER_DURATION.observe(view, request._render_duration)
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        render = response.render
+
+        def timed_render() -> HttpResponse:
+            start = perf_counter()
+            try:
+                return render()
+            finally:
+                request._render_duration += perf_counter() - start
+
+        response.render = timed_render
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable, **kwargs: dict) -> None:
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(
+                request.path_info
+            )
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    # Sends a client's reads to the primary for a while after it writes, so
+    # replica lag never hides its own registration. Must follow
+    # SessionMiddleware.
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS or request.method in SAFE_METHODS:
+            return response
+        if response.status_code < 400 and hasattr(request, "session"):
+            pin_to_primary(request)
+        return response
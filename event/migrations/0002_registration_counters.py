@@ -0,0 +1,93 @@
+# Generated by Django 4.2.9 on 2026-10-18 15:27
+
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+import django.db.models.deletion
+
+
+def fill_registration_counters(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    event_model = apps.get_model("event", "Event")
+    registration_model = apps.get_model("event", "Registration")
+    counter_model = apps.get_model("event", "EventDistanceCounter")
+    totals = {}
+    counters = []
+    tallies = (
+        registration_model.objects.values("event_id", "distances_id")
+        .annotate(total=models.Count("id"))
+        .order_by()
+    )
+    for row in tallies:
+        counters.append(
+            counter_model(
+                event_id=row["event_id"],
+                distance_id=row["distances_id"],
+                registration_count=row["total"],
+            )
+        )
+        totals[row["event_id"]] = (
+            totals.get(row["event_id"], 0) + row["total"]
+        )
+    counter_model.objects.bulk_create(counters, batch_size=1000)
+    for event_id, total in totals.items():
+        event_model.objects.filter(pk=event_id).update(
+            registration_count=total
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="registration_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="EventDistanceCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("registration_count", models.PositiveIntegerField(default=0)),
+                (
+                    "distance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="event_counters",
+                        to="event.distance",
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="distance_counters",
+                        to="event.event",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="eventdistancecounter",
+            constraint=models.UniqueConstraint(
+                fields=("event", "distance"),
+                name="unique_event_distance_counter",
+            ),
+        ),
+        migrations.RunPython(
+            fill_registration_counters, migrations.RunPython.noop
+        ),
+    ]
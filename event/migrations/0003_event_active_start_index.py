@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0002_registration_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["start_datetime"],
+                name="event_active_start_idx",
+            ),
+        ),
+    ]
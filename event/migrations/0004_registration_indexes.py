@@ -0,0 +1,103 @@
+# Generated by Django 4.2.9 on 2026-10-18 15:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+import django.db.models.deletion
+
+
+def remove_duplicate_registrations(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    event_model = apps.get_model("event", "Event")
+    registration_model = apps.get_model("event", "Registration")
+    counter_model = apps.get_model("event", "EventDistanceCounter")
+    duplicates = (
+        registration_model.objects.values("event_id", "runner_id")
+        .annotate(first_id=models.Min("id"), total=models.Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for row in duplicates:
+        extra = registration_model.objects.filter(
+            event_id=row["event_id"], runner_id=row["runner_id"]
+        ).exclude(pk=row["first_id"])
+        for registration in extra:
+            counter_model.objects.filter(
+                event_id=registration.event_id,
+                distance_id=registration.distances_id,
+            ).update(registration_count=models.F("registration_count") - 1)
+            event_model.objects.filter(pk=registration.event_id).update(
+                registration_count=models.F("registration_count") - 1
+            )
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0003_event_active_start_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="registration",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="registrations",
+                to="event.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="registration",
+            name="runner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="registrations",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["start_datetime"],
+                name="event_archived_start_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["event_type", "start_datetime"],
+                name="event_type_start_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="registration",
+            index=models.Index(
+                fields=["event", "distances"],
+                name="registration_event_dist_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="registration",
+            index=models.Index(
+                fields=["runner", "event"],
+                name="registration_runner_event_idx",
+            ),
+        ),
+        migrations.RunPython(
+            remove_duplicate_registrations, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="registration",
+            constraint=models.UniqueConstraint(
+                fields=("event", "runner"),
+                name="unique_event_runner_registration",
+            ),
+        ),
+    ]
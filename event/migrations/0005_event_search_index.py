@@ -0,0 +1,113 @@
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS event_event_fts USING fts5(
+        name, location, organiser, description,
+        content='event_event', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS event_event_fts_insert
+    AFTER INSERT ON event_event BEGIN
+        INSERT INTO event_event_fts(
+            rowid, name, location, organiser, description
+        ) VALUES (
+            new.id, new.name, new.location, new.organiser, new.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS event_event_fts_delete
+    AFTER DELETE ON event_event BEGIN
+        INSERT INTO event_event_fts(
+            event_event_fts, rowid, name, location, organiser, description
+        ) VALUES (
+            'delete', old.id, old.name, old.location, old.organiser,
+            old.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS event_event_fts_update
+    AFTER UPDATE OF name, location, organiser, description ON event_event
+    BEGIN
+        INSERT INTO event_event_fts(
+            event_event_fts, rowid, name, location, organiser, description
+        ) VALUES (
+            'delete', old.id, old.name, old.location, old.organiser,
+            old.description
+        );
+        INSERT INTO event_event_fts(
+            rowid, name, location, organiser, description
+        ) VALUES (
+            new.id, new.name, new.location, new.organiser, new.description
+        );
+    END
+    """,
+    "INSERT INTO event_event_fts(event_event_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS event_event_fts_update",
+    "DROP TRIGGER IF EXISTS event_event_fts_delete",
+    "DROP TRIGGER IF EXISTS event_event_fts_insert",
+    "DROP TABLE IF EXISTS event_event_fts",
+]
+
+POSTGRES_INDEXES = {
+    "event_name_search_idx": ("name",),
+    "event_location_search_idx": ("location",),
+    "event_document_search_idx": (
+        "name", "location", "organiser", "description",
+    ),
+}
+
+
+def get_postgres_indexes() -> list:
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return [
+        GinIndex(SearchVector(*columns, config="simple"), name=name)
+        for name, columns in POSTGRES_INDEXES.items()
+    ]
+
+
+def create_search_index(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        event_model = apps.get_model("event", "Event")
+        for index in get_postgres_indexes():
+            schema_editor.add_index(event_model, index)
+
+
+def drop_search_index(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        event_model = apps.get_model("event", "Event")
+        for index in get_postgres_indexes():
+            schema_editor.remove_index(event_model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0004_registration_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
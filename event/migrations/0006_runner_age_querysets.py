@@ -0,0 +1,20 @@
+# Generated by Django 4.2.9 on 2026-10-18 15:37
+
+from django.db import migrations
+import event.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0005_event_search_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="runner",
+            managers=[
+                ("objects", event.models.RunnerManager()),
+            ],
+        ),
+    ]
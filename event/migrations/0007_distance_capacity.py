@@ -0,0 +1,22 @@
+# Generated by Django 4.2.9 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0006_runner_age_querysets"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventdistancecounter",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Leave empty for unlimited places.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+import importlib
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+search_index = importlib.import_module(
+    "event.migrations.0005_event_search_index"
+)
+
+
+def restore_search_triggers(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    # Changing columns can rebuild event_event on SQLite, which drops the
+    # triggers that keep the FTS table in sync.
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in search_index.SQLITE_FORWARD:
+            if "CREATE TRIGGER" in statement:
+                schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0007_distance_capacity"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:14
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0008_event_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="runner",
+            index=models.Index(
+                condition=models.Q(("is_staff", False)),
+                fields=["last_name", "first_name", "id"],
+                name="runner_directory_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="runner",
+            index=models.Index(
+                django.db.models.functions.text.Lower("last_name"),
+                django.db.models.functions.text.Lower("first_name"),
+                condition=models.Q(("is_staff", False)),
+                name="runner_name_search_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="runner",
+            index=models.Index(
+                django.db.models.functions.text.Lower("city"),
+                condition=models.Q(("is_staff", False)),
+                name="runner_city_search_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0009_runner_directory_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Result",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gun_time", models.DurationField()),
+                ("net_time", models.DurationField()),
+                (
+                    "splits",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text=(
+                            "Seconds since the runner crossed the start, "
+                            "per split."
+                        ),
+                    ),
+                ),
+                ("imported_at", models.DateTimeField(auto_now=True)),
+                (
+                    "registration",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="result",
+                        to="event.registration",
+                    ),
+                ),
+            ],
+        ),
+    ]
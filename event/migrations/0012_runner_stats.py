@@ -0,0 +1,100 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+import django.db.models.deletion
+
+
+def fill_runner_stats(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    registration_model = apps.get_model("event", "Registration")
+    stats_model = apps.get_model("event", "RunnerStats")
+    stats = {}
+    rows = registration_model.objects.order_by(
+        "runner_id", "event__start_datetime", "event_id"
+    ).values_list(
+        "runner_id",
+        "event_id",
+        "event__event_type",
+        "event__start_datetime",
+        "distances__km",
+    )
+    for runner_id, event_id, event_type, start, km in rows.iterator():
+        if runner_id not in stats:
+            stats[runner_id] = stats_model(
+                runner_id=runner_id,
+                km_by_type={},
+                events_by_year={},
+                first_event_id=event_id,
+            )
+        runner_stats = stats[runner_id]
+        runner_stats.total_events += 1
+        runner_stats.km_by_type[event_type] = (
+            runner_stats.km_by_type.get(event_type, 0) + km
+        )
+        year = str(start.year)
+        runner_stats.events_by_year[year] = (
+            runner_stats.events_by_year.get(year, 0) + 1
+        )
+        runner_stats.last_event_id = event_id
+    stats_model.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0011_leaderboards"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RunnerStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_events", models.PositiveIntegerField(default=0)),
+                ("km_by_type", models.JSONField(default=dict)),
+                ("events_by_year", models.JSONField(default=dict)),
+                (
+                    "first_event",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="event.event",
+                    ),
+                ),
+                (
+                    "last_event",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="event.event",
+                    ),
+                ),
+                (
+                    "runner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "runner stats",
+            },
+        ),
+        migrations.RunPython(fill_runner_stats, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,70 @@
-from datetime import datetime
+import time
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
 
-from django.db import models
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import (
+    Cast,
+    Concat,
+    ExtractDay,
+    ExtractMonth,
+    ExtractYear,
+    Lower,
+    Substr,
+)
+from django.db.models.lookups import IsNull, LessThan
+from django.db.models.query import ModelIterable
 from django.utils import timezone
-from django.contrib.auth.models import AbstractUser
+from django.utils.functional import cached_property
+from django.contrib.auth.models import AbstractUser, UserManager
+
+from event.cache import get_distances_version
+
+
+def age_expression(
+    birth_date: str | models.Expression, on_date: str | models.Expression
+) -> models.Expression:
+    def month_day(value: str | models.Expression) -> models.Expression:
+        return ExtractMonth(value) * 100 + ExtractDay(value)
+
+    years = ExtractYear(on_date) - ExtractYear(birth_date)
+    before_birthday = Case(
+        When(LessThan(month_day(on_date), month_day(birth_date)), then=1),
+        default=0,
+    )
+    return Cast(years - before_birthday, models.IntegerField())
+
+
+def age_category_expression(
+    gender: str, age: str | models.Expression
+) -> models.Expression:
+    age = F(age) if isinstance(age, str) else age
+    band = Case(
+        When(LessThan(age, 20), then=Value("U20")),
+        When(LessThan(age, 35), then=Value("SEN")),
+        default=Cast(age / 5 * 5, models.CharField()),
+        output_field=models.CharField(),
+    )
+    return Case(
+        When(IsNull(age, True), then=None),
+        default=Concat(Substr(gender, 1, 1), band),
+        output_field=models.CharField(),
+    )
+
+
+class RunnerQuerySet(models.QuerySet):
+    def with_age(self, on_date: date | None = None) -> "RunnerQuerySet":
+        on_date = Value(on_date or date.today(), models.DateField())
+        return self.annotate(
+            age=age_expression("date_of_birth", on_date)
+        ).annotate(age_category=age_category_expression("gender", "age"))
+
+
+class RunnerManager(UserManager.from_queryset(RunnerQuerySet)):
+    pass
 
 
 class Runner(AbstractUser):
@@ -19,9 +81,41 @@ class Runner(AbstractUser):
     )
     phone_number = models.CharField(max_length=15, null=True, blank=True)
 
+    objects = RunnerManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["last_name", "first_name", "id"],
+                condition=Q(is_staff=False),
+                name="runner_directory_idx",
+            ),
+            models.Index(
+                Lower("last_name"),
+                Lower("first_name"),
+                condition=Q(is_staff=False),
+                name="runner_name_search_idx",
+            ),
+            models.Index(
+                Lower("city"),
+                condition=Q(is_staff=False),
+                name="runner_city_search_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.last_name} {self.first_name}"
 
+    @cached_property
+    def has_registrations(self) -> bool:
+        return self.registrations.exists()
+
+    def get_session_auth_hash(self) -> str:
+        # Runners rebuilt from the cached user context carry the hash in
+        # place of the password; see event.backends.
+        cached_hash = getattr(self, "cached_session_auth_hash", None)
+        return cached_hash or super().get_session_auth_hash()
+
     def get_age(self) -> int:
         today = datetime.today()
         age = today.year - self.date_of_birth.year
@@ -33,13 +127,80 @@ class Runner(AbstractUser):
         return age
 
 
+class DistanceManager(models.Manager):
+    # A process-local copy of the whole table, reloaded when the version in
+    # the shared cache moves so every worker sees changes. A per-process
+    # cache never sees another worker's bump, so the copy also expires after
+    # DISTANCES_SNAPSHOT_MAX_AGE seconds and is reloaded when a caller needs
+    # an id it does not have yet.
+    snapshot = (None, 0.0, {})
+
+    def get_map(self, ids: Iterable[int] = ()) -> dict[int, "Distance"]:
+        version = get_distances_version()
+        loaded_version, loaded_at, distances = self.snapshot
+        age = time.monotonic() - loaded_at
+        expired = age > settings.DISTANCES_SNAPSHOT_MAX_AGE
+        missing = not distances.keys() >= set(ids)
+        if version != loaded_version or expired or missing:
+            distances = {
+                distance.pk: distance
+                for distance in self.get_queryset().order_by("km")
+            }
+            self.snapshot = (version, time.monotonic(), distances)
+        return distances
+
+
 class Distance(models.Model):
     km = models.IntegerField()
 
+    objects = DistanceManager()
+
     def __str__(self) -> str:
         return f"{self.km} km"
 
 
+class JSONGroupArray(models.Aggregate):
+    function = "JSON_GROUP_ARRAY"
+    output_field = models.JSONField()
+
+    def as_postgresql(
+        self, compiler: object, connection: object, **extra_context: dict
+    ) -> tuple[str, list]:
+        return self.as_sql(
+            compiler, connection, function="JSONB_AGG", **extra_context
+        )
+
+    def as_mysql(
+        self, compiler: object, connection: object, **extra_context: dict
+    ) -> tuple[str, list]:
+        return self.as_sql(
+            compiler, connection, function="JSON_ARRAYAGG", **extra_context
+        )
+
+
+class CachedDistancesIterable(ModelIterable):
+    def __iter__(self) -> Iterator["Event"]:
+        distances = Distance.objects.get_map()
+        for event in super().__iter__():
+            if not distances.keys() >= set(event.distance_ids or ()):
+                distances = Distance.objects.get_map(event.distance_ids)
+            event.set_cached_distances(distances)
+            yield event
+
+
+class EventQuerySet(models.QuerySet):
+    def with_cached_distances(self) -> "EventQuerySet":
+        distance_ids = (
+            Event.distances.through.objects.filter(event_id=OuterRef("pk"))
+            .values("event_id")
+            .annotate(ids=JSONGroupArray("distance_id"))
+            .values("ids")
+        )
+        queryset = self.annotate(distance_ids=Subquery(distance_ids))
+        queryset._iterable_class = CachedDistancesIterable
+        return queryset
+
+
 class Event(models.Model):
     EVENT_TYPE_CHOICES = [
         ("Running", "Running"),
@@ -55,19 +216,51 @@ class Event(models.Model):
     event_type = models.CharField(max_length=100, choices=EVENT_TYPE_CHOICES)
     organiser = models.CharField(max_length=100)
     is_active = models.BooleanField(default=True)
+    registration_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ("start_datetime",)
+        indexes = [
+            models.Index(
+                fields=["start_datetime"],
+                condition=Q(is_active=True),
+                name="event_active_start_idx",
+            ),
+            models.Index(
+                fields=["start_datetime"],
+                condition=Q(is_active=False),
+                name="event_archived_start_idx",
+            ),
+            models.Index(
+                fields=["event_type", "start_datetime"],
+                name="event_type_start_idx",
+            ),
+        ]
 
     def get_distances(self) -> list[str]:
-        return [distance.km for distance in self.distances.all()]
+        return [distance.km for distance in self.get_cached_distances()]
 
-    def update_is_active_status(self) -> None:
-        if self.start_datetime <= timezone.now():
-            self.is_active = False
-        else:
-            self.is_active = True
-        self.save()
+    def get_cached_distances(self) -> list[Distance]:
+        if not hasattr(self, "cached_distances"):
+            return list(self.distances.order_by("km"))
+        return self.cached_distances
+
+    def set_cached_distances(self, distances: dict[int, Distance]) -> None:
+        # Templates and forms read this list through get_cached_distances()
+        # instead of querying the distances relation.
+        self.cached_distances = sorted(
+            (
+                distances[pk]
+                for pk in self.distance_ids or ()
+                if pk in distances
+            ),
+            key=lambda distance: distance.km,
+        )
 
     def save(self, *args: tuple, **kwargs: dict) -> None:
         if self.start_datetime <= timezone.now():
@@ -80,20 +273,240 @@ class Event(models.Model):
         return self.name
 
 
+class RegistrationQuerySet(models.QuerySet):
+    def with_age(self) -> "RegistrationQuerySet":
+        return self.annotate(
+            age=age_expression(
+                "runner__date_of_birth", "event__start_datetime"
+            )
+        ).annotate(
+            age_category=age_category_expression("runner__gender", "age")
+        )
+
+
 class Registration(models.Model):
     event = models.ForeignKey(
-        Event, on_delete=models.CASCADE, related_name="registrations"
+        Event,
+        on_delete=models.CASCADE,
+        related_name="registrations",
+        db_index=False,
     )
     runner = models.ForeignKey(
-        Runner, on_delete=models.CASCADE, related_name="registrations"
+        Runner,
+        on_delete=models.CASCADE,
+        related_name="registrations",
+        db_index=False,
     )
     registration_date = models.DateTimeField(auto_now_add=True)
     distances = models.ForeignKey(Distance, on_delete=models.CASCADE)
     status = models.BooleanField(default=True)
 
+    objects = RegistrationQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "runner"],
+                name="unique_event_runner_registration",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["event", "distances"],
+                name="registration_event_dist_idx",
+            ),
+            models.Index(
+                fields=["runner", "event"],
+                name="registration_runner_event_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(
+        cls: type["Registration"],
+        db: str,
+        field_names: list[str],
+        values: list,
+    ) -> "Registration":
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_state()
+        return instance
+
+    def remember_counted_state(self) -> None:
+        self._counted_state = (self.event_id, self.distances_id)
+
+    def save(self, *args: tuple, **kwargs: dict) -> None:
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return (
             f"{self.runner.last_name} "
             f"{self.runner.first_name} - "
             f"{self.event.name}"
         )
+
+
+class Result(models.Model):
+    registration = models.OneToOneField(
+        Registration, on_delete=models.CASCADE, related_name="result"
+    )
+    gun_time = models.DurationField()
+    net_time = models.DurationField()
+    splits = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Seconds since the runner crossed the start, per split.",
+    )
+    imported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.registration}: {self.net_time}"
+
+
+class Leaderboard(models.Model):
+    # Blank gender and age_category mean "all"; see event.leaderboards.
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="leaderboards",
+        db_index=False,
+    )
+    distance = models.ForeignKey(
+        Distance, on_delete=models.CASCADE, related_name="leaderboards"
+    )
+    gender = models.CharField(max_length=10, blank=True)
+    age_category = models.CharField(max_length=10, blank=True)
+    size = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "distance", "gender", "age_category"],
+                name="unique_event_leaderboard",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        board = " ".join(filter(None, [self.gender, self.age_category]))
+        return f"{self.event} - {self.distance}: {board or 'Overall'}"
+
+
+class LeaderboardEntry(models.Model):
+    leaderboard = models.ForeignKey(
+        Leaderboard,
+        on_delete=models.CASCADE,
+        related_name="entries",
+        db_index=False,
+    )
+    registration = models.ForeignKey(
+        Registration,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries",
+    )
+    net_time = models.DurationField()
+    # 1 + the number of strictly faster finishers, so ties share a rank.
+    rank = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["leaderboard", "net_time", "id"],
+                name="leaderboard_entry_time_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.rank}. {self.registration.runner}"
+
+
+class EventDistanceCounter(models.Model):
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="distance_counters"
+    )
+    distance = models.ForeignKey(
+        Distance, on_delete=models.CASCADE, related_name="event_counters"
+    )
+    registration_count = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Leave empty for unlimited places."
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "distance"],
+                name="unique_event_distance_counter",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} - {self.distance}: {self.registration_count}"
+
+    @property
+    def places_left(self) -> int | None:
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.registration_count, 0)
+
+    @classmethod
+    def adjust(
+        cls: type["EventDistanceCounter"],
+        event_id: int,
+        distance_id: int,
+        delta: int,
+    ) -> None:
+        with transaction.atomic():
+            counters = cls.objects.filter(
+                event_id=event_id, distance_id=distance_id
+            )
+            if delta > 0:
+                cls.objects.get_or_create(
+                    event_id=event_id, distance_id=distance_id
+                )
+                room = F("capacity") - delta
+                counters = counters.filter(
+                    Q(capacity__isnull=True) | Q(registration_count__lte=room)
+                )
+            updated = counters.update(
+                registration_count=F("registration_count") + delta
+            )
+            if delta > 0 and not updated:
+                raise ValidationError(
+                    "There are no places left for this distance.",
+                    code="capacity",
+                )
+            Event.objects.filter(pk=event_id).update(
+                registration_count=F("registration_count") + delta,
+                updated_at=timezone.now(),
+            )
+
+
+class RunnerStats(models.Model):
+    # Maintained from registration changes by event.stats.
+    runner = models.OneToOneField(
+        Runner, on_delete=models.CASCADE, related_name="stats"
+    )
+    total_events = models.PositiveIntegerField(default=0)
+    km_by_type = models.JSONField(default=dict)
+    events_by_year = models.JSONField(default=dict)
+    first_event = models.ForeignKey(
+        Event, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    last_event = models.ForeignKey(
+        Event, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+
+    class Meta:
+        verbose_name_plural = "runner stats"
+
+    def __str__(self) -> str:
+        return f"{self.runner}: {self.total_events} event(s)"
+
+    @property
+    def total_km(self) -> int:
+        return sum(self.km_by_type.values())
+
+    @property
+    def events_this_year(self) -> int:
+        return self.events_by_year.get(str(date.today().year), 0)
@@ -0,0 +1,214 @@
+from collections.abc import Iterator
+
+from django.core import signing
+from django.db.models import Model, Q, QuerySet
+
+CURSOR_SALT = "event.pagination.cursor"
+
+
+class CursorPage:
+    def __init__(
+        self,
+        object_list: list[Model],
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self) -> Iterator[Model]:
+        return iter(self.object_list)
+
+    def __getitem__(self, index: int) -> Model:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], "previous")
+
+
+class KeysetPaginator:
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: tuple[str, ...] = ("start_datetime", "id"),
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def get_field_names(self) -> list[str]:
+        return [name.lstrip("-") for name in self.ordering]
+
+    def encode_cursor(self, obj: Model, direction: str) -> str:
+        values = [
+            self.queryset.model._meta.get_field(name).value_to_string(obj)
+            for name in self.get_field_names()
+        ]
+        return signing.dumps([direction, values], salt=CURSOR_SALT)
+
+    def decode_cursor(self, cursor: str | None) -> tuple[str, list] | None:
+        if not cursor:
+            return None
+        try:
+            direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+            names = self.get_field_names()
+            if direction not in ("next", "previous") or (
+                len(values) != len(names)
+            ):
+                return None
+            return direction, [
+                self.queryset.model._meta.get_field(name).to_python(value)
+                for name, value in zip(names, values)
+            ]
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+
+    def get_boundary(self, values: list, direction: str) -> Q:
+        boundary = Q()
+        equal = {}
+        for ordering, value in zip(self.ordering, values):
+            name = ordering.lstrip("-")
+            ascending = not ordering.startswith("-")
+            lookup = "gt" if ascending == (direction == "next") else "lt"
+            boundary |= Q(**equal, **{f"{name}__{lookup}": value})
+            if not equal:
+                seek = Q(**{f"{name}__{lookup}e": value})
+            equal[name] = value
+        return seek & boundary
+
+    def get_page_queryset(
+        self, cursor: str | None
+    ) -> tuple[QuerySet, tuple[str, list] | None]:
+        decoded = self.decode_cursor(cursor)
+        direction = decoded[0] if decoded else "next"
+        ordering = list(self.ordering)
+        queryset = self.queryset
+        if decoded:
+            queryset = queryset.filter(
+                self.get_boundary(decoded[1], direction)
+            )
+        if direction == "previous":
+            ordering = [
+                name[1:] if name.startswith("-") else f"-{name}"
+                for name in ordering
+            ]
+        return queryset.order_by(*ordering)[:self.per_page + 1], decoded
+
+    def make_page(
+        self, rows: list[Model], decoded: tuple[str, list] | None
+    ) -> CursorPage:
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if decoded and decoded[0] == "previous":
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, decoded is not None)
+
+    def page(self, cursor: str | None = None) -> CursorPage:
+        queryset, decoded = self.get_page_queryset(cursor)
+        rows = list(queryset)
+        if decoded and not rows:
+            # The rows behind a stale cursor are gone; start over.
+            return self.page()
+        return self.make_page(rows, decoded)
+
+    async def apage(self, cursor: str | None = None) -> CursorPage:
+        queryset, decoded = self.get_page_queryset(cursor)
+        rows = [row async for row in queryset]
+        if decoded and not rows:
+            return await self.apage()
+        return self.make_page(rows, decoded)
+
+
+class KeysetPaginationMixin:
+    cursor_kwarg = "cursor"
+    cursor_ordering = ("start_datetime", "id")
+
+    def use_keyset_pagination(self) -> bool:
+        return True
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        if getattr(self, "paginated", None) is not None:
+            return self.paginated
+        if not self.use_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size, self.cursor_ordering)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, page_size: int
+    ) -> tuple:
+        if self.use_keyset_pagination():
+            paginator = KeysetPaginator(
+                queryset, page_size, self.cursor_ordering
+            )
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_kwarg)
+            )
+        else:
+            paginator = self.get_paginator(queryset, page_size)
+            paginator.count = await queryset.acount()
+            page = paginator.get_page(self.request.GET.get(self.page_kwarg))
+            page.object_list = [row async for row in page.object_list]
+        self.paginated = (
+            paginator, page, page.object_list, page.has_other_pages()
+        )
+        return self.paginated
+
+    def get_page_query(self, **params: str) -> str:
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        query.pop(self.page_kwarg, None)
+        query.update(params)
+        return query.urlencode()
+
+    def get_context_data(self, **kwargs: dict) -> dict:
+        context = super().get_context_data(**kwargs)
+        page = context.get("page_obj")
+        if page is None:
+            return context
+        if isinstance(page, CursorPage):
+            if page.has_previous():
+                context["previous_page_query"] = self.get_page_query(
+                    **{self.cursor_kwarg: page.previous_cursor}
+                )
+            if page.has_next():
+                context["next_page_query"] = self.get_page_query(
+                    **{self.cursor_kwarg: page.next_cursor}
+                )
+        else:
+            if page.has_previous():
+                context["previous_page_query"] = self.get_page_query(
+                    **{self.page_kwarg: page.previous_page_number()}
+                )
+            if page.has_next():
+                context["next_page_query"] = self.get_page_query(
+                    **{self.page_kwarg: page.next_page_number()}
+                )
+        return context
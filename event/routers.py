@@ -0,0 +1,103 @@
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+PRIMARY_PIN_KEY = "primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replica() -> bool:
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get()
+
+
+def pin_to_primary(request: HttpRequest) -> None:
+    request.session[PRIMARY_PIN_KEY] = (
+        time.time() + settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(request: HttpRequest) -> bool:
+    session = getattr(request, "session", None)
+    if session is None:
+        return False
+    return session.get(PRIMARY_PIN_KEY, 0) > time.time()
+
+
+class ReplicaRouter:
+    # Sessions are written on almost any request, so a lagging replica could
+    # hand back a stale login.
+    primary_only_apps = {"sessions"}
+
+    def db_for_read(self, model: type[Model], **hints: dict) -> str | None:
+        if not reads_from_replica():
+            return None
+        if model._meta.app_label in self.primary_only_apps:
+            return "default"
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints: dict) -> str:
+        return "default"
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: dict) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: dict) -> bool:
+        return db not in settings.DATABASE_REPLICAS
+
+
+def render_on_replica(response: HttpResponse) -> HttpResponse:
+    # Querysets handed to the template are only evaluated while rendering,
+    # after dispatch() has returned.
+    if hasattr(response, "render"):
+        render = response.render
+
+        def replica_render() -> HttpResponse:
+            with replica_reads():
+                return render()
+
+        response.render = replica_render
+    return response
+
+
+class ReplicaReadMixin:
+    # Must follow LoginRequiredMixin in the bases: the async views skip past
+    # it straight to the next dispatch().
+    def dispatch(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        if not settings.DATABASE_REPLICAS or is_pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+        return render_on_replica(response)
+
+    async def adispatch(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS:
+            return await super().dispatch(request, *args, **kwargs)
+        if await sync_to_async(is_pinned_to_primary)(request):
+            return await super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            response = await super().dispatch(request, *args, **kwargs)
+        return render_on_replica(response)
@@ -0,0 +1,131 @@
+import re
+
+from django.db import connections
+from django.db.models import Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+SEARCH_TABLE = "event_event_fts"
+SEARCH_COLUMNS = ("name", "location", "organiser", "description")
+TOKEN_PATTERN = re.compile(r"\w+")
+RUNNER_NAME_COLUMNS = ("last_name", "first_name")
+# Sorts after every other character, closing a prefix range.
+MAX_CHAR = "\U0010ffff"
+
+
+def get_tokens(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text or "")
+
+
+def search_events(
+    queryset: QuerySet, text: str = "", **columns: str
+) -> QuerySet:
+    terms = {
+        column: get_tokens(value)
+        for column, value in columns.items()
+        if column in SEARCH_COLUMNS and get_tokens(value)
+    }
+    text_tokens = get_tokens(text)
+    if not terms and not text_tokens:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, terms, text_tokens)
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, terms, text_tokens)
+    return _search_fallback(queryset, terms, text_tokens)
+
+
+def _search_sqlite(
+    queryset: QuerySet, terms: dict, text_tokens: list[str]
+) -> QuerySet:
+    clauses = [
+        f'{column} : "{token}"*'
+        for column, tokens in terms.items()
+        for token in tokens
+    ]
+    clauses += [f'"{token}"*' for token in text_tokens]
+    match = " AND ".join(clauses)
+    table = queryset.model._meta.db_table
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s",
+            (match,),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT rank FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s "
+            f'AND rowid = "{table}"."id"',
+            (match,),
+        )
+    ).order_by("search_rank", "start_datetime", "id")
+
+
+def _search_postgresql(
+    queryset: QuerySet, terms: dict, text_tokens: list[str]
+) -> QuerySet:
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+    )
+
+    vectors = {
+        column: SearchVector(column, config="simple") for column in terms
+    }
+    if text_tokens:
+        vectors["document"] = SearchVector(*SEARCH_COLUMNS, config="simple")
+        terms = {**terms, "document": text_tokens}
+
+    rank = None
+    for column, tokens in terms.items():
+        query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config="simple",
+        )
+        queryset = queryset.annotate(
+            **{f"search_{column}": vectors[column]}
+        ).filter(**{f"search_{column}": query})
+        column_rank = SearchRank(vectors[column], query)
+        rank = column_rank if rank is None else rank + column_rank
+    return queryset.annotate(search_rank=rank).order_by(
+        "-search_rank", "start_datetime", "id"
+    )
+
+
+def _search_fallback(
+    queryset: QuerySet, terms: dict, text_tokens: list[str]
+) -> QuerySet:
+    for column, tokens in terms.items():
+        for token in tokens:
+            queryset = queryset.filter(**{f"{column}__icontains": token})
+    for token in text_tokens:
+        any_column = Q()
+        for column in SEARCH_COLUMNS:
+            any_column |= Q(**{f"{column}__icontains": token})
+        queryset = queryset.filter(any_column)
+    return queryset
+
+
+def search_runners(
+    queryset: QuerySet, name: str = "", city: str = ""
+) -> QuerySet:
+    prefixes = dict(zip(RUNNER_NAME_COLUMNS, name.split()))
+    if city.strip():
+        prefixes["city"] = city.strip()
+    for column, prefix in prefixes.items():
+        # A range on LOWER(column) can use the expression indexes on every
+        # backend, unlike LIKE on SQLite. Lowering both sides in SQL keeps
+        # the comparison consistent with how the index was built.
+        alias = f"{column}_lower"
+        queryset = queryset.alias(**{alias: Lower(column)}).filter(
+            **{
+                f"{alias}__gte": Lower(Value(prefix)),
+                f"{alias}__lt": Lower(Value(prefix + MAX_CHAR)),
+            }
+        )
+    return queryset
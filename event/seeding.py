@@ -0,0 +1,212 @@
+import random
+from collections import Counter
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from event.cache import bump_generation
+from event.models import (
+    Distance,
+    Event,
+    EventDistanceCounter,
+    Registration,
+    Runner,
+)
+from event.stats import rebuild_runner_stats
+
+SEED_PASSWORD = "runner12345"
+DISTANCE_KMS = (5, 10, 21, 42, 50, 100)
+FIRST_NAMES = (
+    "Olena", "Andrii", "Iryna", "Taras", "Sofiia", "Dmytro", "Mariia",
+    "Oleksandr", "Kateryna", "Maksym", "Anna", "Bohdan", "Yuliia", "Ivan",
+)
+LAST_NAMES = (
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Melnyk", "Boiko", "Oliinyk", "Lysenko", "Moroz", "Savchenko", "Rudenko",
+)
+CITIES = (
+    "Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Vinnytsia", "Poltava",
+    "Chernihiv", "Uzhhorod", "Ivano-Frankivsk",
+)
+ORGANISERS = ("New Run", "Run Ukraine", "Kyiv Cyclists", "Open Water Club")
+
+
+def seed_data(
+    runners: int,
+    events: int,
+    registrations: int,
+    seed: int = 0,
+    batch_size: int = 5000,
+    now: datetime | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, int]:
+    rng = random.Random(seed)
+    now = now or timezone.now().replace(minute=0, second=0, microsecond=0)
+    progress = progress or (lambda message: None)
+
+    with transaction.atomic():
+        existing = dict(
+            Distance.objects.filter(km__in=DISTANCE_KMS).values_list(
+                "km", "id"
+            )
+        )
+        distance_ids = [
+            existing.get(km) or Distance.objects.create(km=km).pk
+            for km in DISTANCE_KMS
+        ]
+        runner_ids = seed_runners(rng, runners, seed, batch_size)
+        progress(f"Created {len(runner_ids)} runner(s)")
+
+        plans = plan_events(
+            rng, events, registrations, distance_ids, len(runner_ids)
+        )
+        event_ids = seed_events(rng, plans, now, batch_size)
+        progress(f"Created {len(event_ids)} event(s)")
+
+        created = seed_registrations(
+            rng, plans, event_ids, runner_ids, batch_size, progress
+        )
+        progress(f"Summarised {rebuild_runner_stats()} runner(s)")
+    bump_generation()
+
+    return {
+        "runners": len(runner_ids),
+        "events": len(event_ids),
+        "registrations": created,
+    }
+
+
+def seed_runners(
+    rng: random.Random, count: int, seed: int, batch_size: int
+) -> list[int]:
+    password = make_password(SEED_PASSWORD)
+    born_after = date(1950, 1, 1)
+    runner_ids = []
+    for start in range(0, count, batch_size):
+        batch = []
+        for number in range(start, min(start + batch_size, count)):
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            batch.append(
+                Runner(
+                    username=f"seed{seed}-runner{number}",
+                    password=password,
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"seed{seed}-runner{number}@example.com",
+                    city=rng.choice(CITIES),
+                    gender=rng.choice(("Male", "Female")),
+                    date_of_birth=born_after + timedelta(
+                        days=rng.randrange(365 * 55)
+                    ),
+                )
+            )
+        runner_ids.extend(
+            runner.pk for runner in Runner.objects.bulk_create(batch)
+        )
+    return runner_ids
+
+
+def plan_events(
+    rng: random.Random,
+    count: int,
+    registrations: int,
+    distance_ids: list[int],
+    runner_count: int,
+) -> list[tuple[list[int], int]]:
+    weights = [rng.uniform(0.2, 1.8) for _ in range(count)]
+    total_weight = sum(weights) or 1
+    sizes = [int(registrations * weight / total_weight) for weight in weights]
+    for index in range(registrations - sum(sizes) if count else 0):
+        sizes[index % count] += 1
+
+    plans = []
+    for size in sizes:
+        offered = rng.sample(distance_ids, rng.randint(1, 4))
+        plans.append((sorted(offered), min(size, runner_count)))
+    return plans
+
+
+def seed_events(
+    rng: random.Random,
+    plans: list[tuple[list[int], int]],
+    now: datetime,
+    batch_size: int,
+) -> list[int]:
+    event_types = [choice for choice, _ in Event.EVENT_TYPE_CHOICES]
+    through = Event.distances.through
+    event_ids = []
+    for start in range(0, len(plans), batch_size):
+        batch = []
+        for number in range(start, min(start + batch_size, len(plans))):
+            start_datetime = now + timedelta(
+                days=rng.randint(-730, 365), hours=rng.randint(6, 10)
+            )
+            city = rng.choice(CITIES)
+            batch.append(
+                Event(
+                    name=f"{city} Race #{number + 1}",
+                    start_datetime=start_datetime,
+                    location=city,
+                    description=f"Seeded event {number + 1} in {city}.",
+                    event_type=rng.choice(event_types),
+                    organiser=rng.choice(ORGANISERS),
+                    is_active=start_datetime > now,
+                    registration_count=plans[number][1],
+                )
+            )
+        created = Event.objects.bulk_create(batch)
+        through.objects.bulk_create(
+            through(event_id=event.pk, distance_id=distance_id)
+            for event, (offered, _) in zip(created, plans[start:])
+            for distance_id in offered
+        )
+        event_ids.extend(event.pk for event in created)
+    return event_ids
+
+
+def seed_registrations(
+    rng: random.Random,
+    plans: list[tuple[list[int], int]],
+    event_ids: list[int],
+    runner_ids: list[int],
+    batch_size: int,
+    progress: Callable[[str], None],
+) -> int:
+    tally = Counter()
+    batch = []
+    created = 0
+    for event_id, (offered, size) in zip(event_ids, plans):
+        for runner_id in rng.sample(runner_ids, size):
+            distance_id = rng.choice(offered)
+            tally[event_id, distance_id] += 1
+            batch.append(
+                Registration(
+                    event_id=event_id,
+                    runner_id=runner_id,
+                    distances_id=distance_id,
+                )
+            )
+            if len(batch) >= batch_size:
+                created += len(Registration.objects.bulk_create(batch))
+                batch = []
+                progress(f"Created {created} registration(s)")
+    if batch:
+        created += len(Registration.objects.bulk_create(batch))
+        progress(f"Created {created} registration(s)")
+
+    EventDistanceCounter.objects.bulk_create(
+        (
+            EventDistanceCounter(
+                event_id=event_id,
+                distance_id=distance_id,
+                registration_count=count,
+            )
+            for (event_id, distance_id), count in tally.items()
+        ),
+        batch_size=batch_size,
+    )
+    return created
@@ -0,0 +1,241 @@
+from django.db.models import Model, QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from event.cache import (
+    bump_distances_version,
+    bump_generation,
+    invalidate_user_context,
+)
+from event.leaderboards import remove_from_leaderboards, update_leaderboards
+from event.models import (
+    Distance,
+    Event,
+    EventDistanceCounter,
+    Registration,
+    Result,
+    Runner,
+)
+from event.stats import rebuild_runner_stats, record_registration
+
+
+@receiver(pre_save, sender=Registration)
+def remember_registration_state(
+    sender: type[Registration], instance: Registration, **kwargs: dict
+) -> None:
+    if instance._state.adding or hasattr(instance, "_counted_state"):
+        return
+    instance._counted_state = (
+        Registration.objects.filter(pk=instance.pk)
+        .values_list("event_id", "distances_id")
+        .first()
+    )
+
+
+# Connected before count_saved_registration, which forgets the old state.
+@receiver(post_save, sender=Registration)
+def rerank_moved_registration(
+    sender: type[Registration],
+    instance: Registration,
+    created: bool,
+    **kwargs: dict,
+) -> None:
+    if created or instance._counted_state == (
+        instance.event_id,
+        instance.distances_id,
+    ):
+        return
+    if Result.objects.filter(registration=instance).exists():
+        update_leaderboards(instance.pk)
+
+
+@receiver(post_save, sender=Registration)
+def track_saved_registration(
+    sender: type[Registration],
+    instance: Registration,
+    created: bool,
+    **kwargs: dict,
+) -> None:
+    previous = None if created else instance._counted_state
+    if previous == (instance.event_id, instance.distances_id):
+        return
+    removed = None
+    if previous is not None:
+        event_id, distance_id = previous
+        if event_id == instance.event_id:
+            removed = (instance.event, distance_id)
+        else:
+            removed = (Event.objects.get(pk=event_id), distance_id)
+    record_registration(
+        instance.runner_id, removed, (instance.event, instance.distances_id)
+    )
+
+
+@receiver(post_save, sender=Registration)
+def count_saved_registration(
+    sender: type[Registration],
+    instance: Registration,
+    created: bool,
+    **kwargs: dict,
+) -> None:
+    previous = None if created else instance._counted_state
+    current = (instance.event_id, instance.distances_id)
+    if previous != current:
+        if previous is not None:
+            EventDistanceCounter.adjust(*previous, -1)
+        EventDistanceCounter.adjust(*current, 1)
+    instance.remember_counted_state()
+
+
+@receiver(post_delete, sender=Registration)
+def count_deleted_registration(
+    sender: type[Registration], instance: Registration, **kwargs: dict
+) -> None:
+    EventDistanceCounter.adjust(
+        instance.event_id, instance.distances_id, -1
+    )
+
+
+@receiver(post_delete, sender=Registration)
+def track_deleted_registration(
+    sender: type[Registration],
+    instance: Registration,
+    origin: object,
+    **kwargs: dict,
+) -> None:
+    # A deleted runner takes their stats along.
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if model is not Runner:
+        record_registration(
+            instance.runner_id,
+            removed=(instance.event, instance.distances_id),
+        )
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_activity(
+    sender: type[Event], instance: Event, **kwargs: dict
+) -> None:
+    if not instance._state.adding:
+        instance._activity_state = (
+            Event.objects.filter(pk=instance.pk)
+            .values_list("event_type", "start_datetime")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Event)
+def track_event_activity(
+    sender: type[Event], instance: Event, created: bool, **kwargs: dict
+) -> None:
+    previous = None if created else instance._activity_state
+    if previous and previous != (instance.event_type, instance.start_datetime):
+        rebuild_runner_stats(
+            Registration.objects.filter(event=instance).values("runner_id")
+        )
+
+
+@receiver(m2m_changed, sender=Event.distances.through)
+def touch_events_with_changed_distances(
+    sender: type[Model],
+    instance: Event | Distance,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: dict,
+) -> None:
+    if not reverse and action.startswith("post_"):
+        events = Event.objects.filter(pk=instance.pk)
+    elif reverse and action in ("post_add", "post_remove"):
+        events = Event.objects.filter(pk__in=pk_set)
+    elif reverse and action == "pre_clear":
+        events = Event.objects.filter(distances=instance)
+    else:
+        return
+    events.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Distance)
+@receiver(pre_delete, sender=Distance)
+def touch_events_with_distance(
+    sender: type[Distance],
+    instance: Distance,
+    created: bool = False,
+    **kwargs: dict,
+) -> None:
+    if not created:
+        Event.objects.filter(distances=instance).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=EventDistanceCounter)
+@receiver(post_delete, sender=EventDistanceCounter)
+def touch_counter_event(
+    sender: type[EventDistanceCounter],
+    instance: EventDistanceCounter,
+    **kwargs: dict,
+) -> None:
+    Event.objects.filter(pk=instance.event_id).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+@receiver(post_save, sender=Distance)
+@receiver(post_delete, sender=Distance)
+@receiver(m2m_changed, sender=Event.distances.through)
+def invalidate_event_list_cache(sender: type[Model], **kwargs: dict) -> None:
+    bump_generation()
+
+
+@receiver(post_save, sender=Runner)
+@receiver(post_delete, sender=Runner)
+def invalidate_runner_context(
+    sender: type[Runner], instance: Runner, **kwargs: dict
+) -> None:
+    invalidate_user_context(instance.pk)
+
+
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+def invalidate_registrant_context(
+    sender: type[Registration], instance: Registration, **kwargs: dict
+) -> None:
+    invalidate_user_context(instance.runner_id)
+
+
+@receiver(post_save, sender=Distance)
+@receiver(post_delete, sender=Distance)
+def invalidate_distances(
+    sender: type[Distance], instance: Distance, **kwargs: dict
+) -> None:
+    bump_distances_version()
+
+
+@receiver(post_save, sender=Result)
+def rank_saved_result(
+    sender: type[Result], instance: Result, **kwargs: dict
+) -> None:
+    update_leaderboards(instance.registration_id, instance.net_time)
+
+
+@receiver(pre_delete, sender=Result)
+def unrank_deleted_result(
+    sender: type[Result], instance: Result, origin: object, **kwargs: dict
+) -> None:
+    # Leaderboards go with a deleted event or distance; re-ranking the
+    # finishers one by one first would only slow the delete down.
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if model not in (Event, Distance):
+        remove_from_leaderboards(instance.registration_id)
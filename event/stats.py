@@ -0,0 +1,118 @@
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from event.models import Distance, Event, Registration, RunnerStats
+
+
+def tally(totals: dict, key: str, delta: int) -> None:
+    totals[key] = totals.get(key, 0) + delta
+    if not totals[key]:
+        del totals[key]
+
+
+def history_bounds(runner_id: int) -> tuple[Event | None, Event | None]:
+    history = Event.objects.filter(registrations__runner_id=runner_id)
+    return (
+        history.order_by("start_datetime", "id").first(),
+        history.order_by("-start_datetime", "-id").first(),
+    )
+
+
+def record_registration(
+    runner_id: int,
+    removed: tuple[Event, int] | None = None,
+    added: tuple[Event, int] | None = None,
+) -> None:
+    # removed and added are (event, distance id) pairs; a moved
+    # registration passes both.
+    distances = Distance.objects.get_map(
+        change[1] for change in (removed, added) if change
+    )
+    stats = RunnerStats.objects.select_for_update(of=("self",))
+    stats = stats.select_related("first_event", "last_event")
+    with transaction.atomic():
+        if added:
+            runner_stats, _ = stats.get_or_create(runner_id=runner_id)
+        else:
+            runner_stats = stats.filter(runner_id=runner_id).first()
+            if runner_stats is None:
+                return
+        for change, delta in ((removed, -1), (added, 1)):
+            if change is None:
+                continue
+            event, distance_id = change
+            runner_stats.total_events += delta
+            tally(
+                runner_stats.km_by_type,
+                event.event_type,
+                delta * distances[distance_id].km,
+            )
+            tally(
+                runner_stats.events_by_year,
+                str(event.start_datetime.year),
+                delta,
+            )
+
+        first, last = runner_stats.first_event, runner_stats.last_event
+        bounds = {runner_stats.first_event_id, runner_stats.last_event_id}
+        if removed and added and removed[0].pk == added[0].pk:
+            # A new distance at the same event leaves the bounds alone.
+            removed = added = None
+        if removed and bounds & {None, removed[0].pk}:
+            # The removed event bounded the history (or was deleted and
+            # nulled out already), so look the bounds up again.
+            first, last = history_bounds(runner_id)
+        elif added:
+            event = added[0]
+            position = (event.start_datetime, event.pk)
+            if first is None or position < (first.start_datetime, first.pk):
+                first = event
+            if last is None or position > (last.start_datetime, last.pk):
+                last = event
+        runner_stats.first_event, runner_stats.last_event = first, last
+        runner_stats.save()
+
+
+def rebuild_runner_stats(
+    runner_ids: Iterable[int] | QuerySet | None = None,
+) -> int:
+    registrations = Registration.objects.order_by()
+    stats = RunnerStats.objects.all()
+    if runner_ids is not None:
+        registrations = registrations.filter(runner_id__in=runner_ids)
+        stats = stats.filter(runner_id__in=runner_ids)
+    rows = registrations.values_list(
+        "runner_id",
+        "event_id",
+        "event__event_type",
+        "event__start_datetime",
+        "distances__km",
+    )
+
+    built = {}
+    bounds = {}
+    for runner_id, event_id, event_type, start, km in rows.iterator(
+        chunk_size=5000
+    ):
+        runner_stats = built.get(runner_id)
+        if runner_stats is None:
+            runner_stats = built[runner_id] = RunnerStats(runner_id=runner_id)
+            bounds[runner_id] = [(start, event_id), (start, event_id)]
+        runner_stats.total_events += 1
+        tally(runner_stats.km_by_type, event_type, km)
+        tally(runner_stats.events_by_year, str(start.year), 1)
+        first, last = bounds[runner_id]
+        bounds[runner_id] = [
+            min(first, (start, event_id)),
+            max(last, (start, event_id)),
+        ]
+    for runner_id, (first, last) in bounds.items():
+        built[runner_id].first_event_id = first[1]
+        built[runner_id].last_event_id = last[1]
+
+    with transaction.atomic():
+        stats.delete()
+        RunnerStats.objects.bulk_create(built.values(), batch_size=5000)
+    return len(built)
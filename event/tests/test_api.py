@@ -0,0 +1,172 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from event.models import Distance, Event, EventDistanceCounter, Registration
+
+LIST_URL = reverse("event:api_event_list")
+
+
+def detail_url(event: Event) -> str:
+    return reverse("event:api_event_detail", kwargs={"pk": event.pk})
+
+
+def distances_url(event: Event) -> str:
+    return reverse("event:api_event_distances", kwargs={"pk": event.pk})
+
+
+class EventAPITests(TestCase):
+    def setUp(self) -> None:
+        self.five = Distance.objects.create(km=5)
+        self.ten = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Kyiv Run",
+            start_datetime=datetime(2030, 5, 1, 9),
+            location="Kyiv",
+            description="Spring race",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.event.distances.set([self.five, self.ten])
+        self.runner = get_user_model().objects.create_user(
+            username="runner",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+
+    def register(self) -> Registration:
+        return Registration.objects.create(
+            event=self.event, runner=self.runner, distances=self.ten
+        )
+
+    def revalidate(self, url: str, response: object) -> int:
+        return self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        ).status_code
+
+    def test_list_is_public_json(self) -> None:
+        self.register()
+        res = self.client.get(LIST_URL)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/json")
+        event = res.json()["results"][0]
+        self.assertEqual(event["name"], "Kyiv Run")
+        self.assertEqual(event["distances"], [5, 10])
+        self.assertEqual(event["registration_count"], 1)
+        self.assertIsNone(res.json()["next"])
+
+    def test_list_query_count_does_not_grow_with_events(self) -> None:
+        for number in range(5):
+            event = Event.objects.create(
+                name=f"Race {number}",
+                start_datetime=datetime(2030, 6, number + 1, 9),
+                location="Lviv",
+                event_type="Running",
+            )
+            event.distances.set([self.five, self.ten])
+        with self.assertNumQueries(3):
+            res = self.client.get(LIST_URL)
+        self.assertEqual(len(res.json()["results"]), 6)
+
+    def test_list_filters_by_event_type(self) -> None:
+        Event.objects.create(
+            name="Dnipro Swim",
+            start_datetime=datetime(2030, 7, 1, 9),
+            location="Dnipro",
+            event_type="Swimming",
+        )
+        res = self.client.get(LIST_URL, {"event_type": "Swimming"})
+        names = [event["name"] for event in res.json()["results"]]
+        self.assertEqual(names, ["Dnipro Swim"])
+
+    def test_list_pages_with_cursor(self) -> None:
+        for number in range(60):
+            Event.objects.create(
+                name=f"Race {number}",
+                start_datetime=datetime(2031, 1, 1, 9),
+                location="Lviv",
+                event_type="Running",
+            )
+        first = self.client.get(LIST_URL).json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(first["results"]), 50)
+        self.assertEqual(len(second["results"]), 11)
+        self.assertIsNone(second["next"])
+
+    def test_detail_includes_distance_counts(self) -> None:
+        self.register()
+        EventDistanceCounter.objects.filter(distance=self.ten).update(
+            capacity=20
+        )
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(self.event))
+        data = res.json()
+        self.assertEqual(data["description"], "Spring race")
+        self.assertEqual(
+            data["distances"],
+            [
+                {"km": 5, "registration_count": 0, "capacity": None},
+                {"km": 10, "registration_count": 1, "capacity": 20},
+            ],
+        )
+
+    def test_missing_event_is_404(self) -> None:
+        res = self.client.get(
+            reverse("event:api_event_detail", kwargs={"pk": 999})
+        )
+        self.assertEqual(res.status_code, 404)
+
+    def test_unchanged_resources_return_304(self) -> None:
+        for url in (LIST_URL, detail_url(self.event)):
+            res = self.client.get(url)
+            self.assertTrue(res.has_header("Last-Modified"))
+            self.assertEqual(self.revalidate(url, res), 304)
+            not_modified = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+            )
+            self.assertEqual(not_modified.status_code, 304)
+
+    def test_last_modified_converts_local_time_to_gmt(self) -> None:
+        # Kyiv is on UTC+3 in July.
+        Event.objects.filter(pk=self.event.pk).update(
+            updated_at=datetime(2030, 7, 1, 17, 53, 46)
+        )
+        res = self.client.get(detail_url(self.event))
+        self.assertEqual(
+            res["Last-Modified"], "Mon, 01 Jul 2030 14:53:46 GMT"
+        )
+
+    def test_registration_changes_etag(self) -> None:
+        url = distances_url(self.event)
+        res = self.client.get(url)
+        listing = self.client.get(LIST_URL)
+        self.register()
+        self.assertEqual(self.revalidate(url, res), 200)
+        self.assertEqual(self.revalidate(LIST_URL, listing), 200)
+
+    def test_capacity_change_changes_etag(self) -> None:
+        self.register()
+        url = distances_url(self.event)
+        res = self.client.get(url)
+        counter = EventDistanceCounter.objects.get(distance=self.ten)
+        counter.capacity = 10
+        counter.save()
+        self.assertEqual(self.revalidate(url, res), 200)
+
+    def test_distance_set_change_changes_etag(self) -> None:
+        url = detail_url(self.event)
+        res = self.client.get(url)
+        self.five.events.remove(self.event)
+        self.assertEqual(self.revalidate(url, res), 200)
+        res = self.client.get(url)
+        self.event.distances.add(self.five)
+        self.assertEqual(self.revalidate(url, res), 200)
+
+    def test_event_edit_changes_etag(self) -> None:
+        url = detail_url(self.event)
+        res = self.client.get(url)
+        self.event.name = "Kyiv Night Run"
+        self.event.save()
+        self.assertEqual(self.revalidate(url, res), 200)
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from event.backends import CachedModelBackend
+from event.cache import get_user_context, invalidate_user_context
+from event.models import Distance, Event, Registration
+
+RUNNER_URL = reverse("event:runner_list")
+
+
+class CachedUserContextTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="runner",
+            password="test123",
+            first_name="Olena",
+            last_name="Melnyk",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.distance = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Kyiv Run",
+            start_datetime=datetime(2030, 5, 1, 9),
+            location="Kyiv",
+            event_type="Running",
+        )
+        self.event.distances.add(self.distance)
+
+    def get_queries(self) -> list[str]:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(RUNNER_URL)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in context.captured_queries]
+
+    def test_cached_context_skips_runner_and_sidebar_queries(self) -> None:
+        cold = self.get_queries()
+        warm = self.get_queries()
+        self.assertEqual(len(warm), len(cold) - 2)
+        self.assertFalse(
+            any('"event_registration"' in query for query in warm)
+        )
+
+    def test_registration_invalidates_context(self) -> None:
+        self.assertContains(
+            self.client.get(RUNNER_URL), "No registrations available"
+        )
+        registration = Registration.objects.create(
+            event=self.event, runner=self.user, distances=self.distance
+        )
+        self.assertContains(self.client.get(RUNNER_URL), "My registrations")
+        registration.delete()
+        self.assertContains(
+            self.client.get(RUNNER_URL), "No registrations available"
+        )
+
+    def test_profile_change_invalidates_context(self) -> None:
+        self.client.get(RUNNER_URL)
+        self.user.last_name = "Shevchenko"
+        self.user.save()
+        self.assertContains(self.client.get(RUNNER_URL), "Shevchenko Olena")
+
+    def test_password_change_ends_other_sessions(self) -> None:
+        self.client.get(RUNNER_URL)
+        self.user.set_password("changed123")
+        self.user.save()
+        self.assertEqual(self.client.get(RUNNER_URL).status_code, 302)
+
+    def test_deactivated_runner_is_logged_out(self) -> None:
+        self.client.get(RUNNER_URL)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(RUNNER_URL).status_code, 302)
+
+    def test_cached_context_leaves_out_the_password(self) -> None:
+        self.client.get(RUNNER_URL)
+        context = get_user_context(self.user.pk)
+        self.assertNotIn("password", context)
+        self.assertNotIn(self.user.password, context.values())
+        with self.assertNumQueries(0):
+            user = CachedModelBackend().get_user(self.user.pk)
+            self.assertEqual(
+                user.get_session_auth_hash(),
+                self.user.get_session_auth_hash(),
+            )
+
+    def test_sessions_from_model_backend_stay_signed_in(self) -> None:
+        self.client.force_login(
+            self.user, "django.contrib.auth.backends.ModelBackend"
+        )
+        self.assertEqual(self.client.get(RUNNER_URL).status_code, 200)
+
+    def test_bulk_deactivation_needs_explicit_invalidation(self) -> None:
+        self.client.get(RUNNER_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        invalidate_user_context(self.user.pk)
+        self.assertEqual(self.client.get(RUNNER_URL).status_code, 302)
@@ -0,0 +1,102 @@
+from datetime import datetime
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+
+from event.benchmark import (
+    find_regressions,
+    get_route_urls,
+    run_benchmarks,
+    run_sqlite_benchmarks,
+)
+from event.models import Event, EventDistanceCounter, Registration, Runner
+from event.seeding import seed_data
+from event.urls import urlpatterns
+
+SEED_NOW = datetime(2024, 6, 1)
+
+
+class SeedDataTests(TestCase):
+    def test_seeds_requested_volumes(self) -> None:
+        summary = seed_data(
+            runners=40, events=6, registrations=120, now=SEED_NOW
+        )
+        self.assertEqual(
+            summary, {"runners": 40, "events": 6, "registrations": 120}
+        )
+        self.assertEqual(Runner.objects.count(), 40)
+        self.assertEqual(Registration.objects.count(), 120)
+        self.assertFalse(Event.objects.filter(distances=None).exists())
+
+    def test_counters_match_registrations(self) -> None:
+        seed_data(runners=40, events=6, registrations=120, now=SEED_NOW)
+        for event in Event.objects.all():
+            self.assertEqual(
+                event.registration_count, event.registrations.count()
+            )
+        self.assertEqual(
+            EventDistanceCounter.objects.aggregate(
+                total=Sum("registration_count")
+            )["total"],
+            120,
+        )
+
+    def test_same_seed_produces_same_data(self) -> None:
+        def snapshot() -> list[tuple]:
+            return list(
+                Event.objects.order_by("pk").values_list(
+                    "name", "start_datetime", "registration_count"
+                )
+            )
+
+        seed_data(runners=20, events=5, registrations=40, now=SEED_NOW)
+        first = snapshot()
+        Event.objects.all().delete()
+        Runner.objects.all().delete()
+        seed_data(runners=20, events=5, registrations=40, now=SEED_NOW)
+        self.assertEqual(snapshot(), first)
+
+
+class BenchmarkTests(TestCase):
+    def test_every_route_is_benchmarked(self) -> None:
+        seed_data(runners=20, events=4, registrations=30, now=SEED_NOW)
+        results = run_benchmarks(repeat=1)
+        self.assertEqual(
+            set(results), {pattern.name for pattern in urlpatterns}
+        )
+        for result in results.values():
+            self.assertGreater(result["queries"], 0)
+
+    def test_route_urls_use_seeded_objects(self) -> None:
+        seed_data(runners=20, events=4, registrations=30, now=SEED_NOW)
+        registration = Registration.objects.first()
+        urls = get_route_urls(registration.event, registration)
+        self.assertEqual(
+            urls["registration_update"],
+            f"/registrations/{registration.pk}/update/",
+        )
+
+    def test_regressions_past_threshold(self) -> None:
+        baseline = {
+            "index": {"latency_ms": 10.0, "queries": 5},
+            "archive_list": {"latency_ms": 10.0, "queries": 5},
+        }
+        results = {
+            "index": {"latency_ms": 12.0, "queries": 5},
+            "archive_list": {"latency_ms": 13.0, "queries": 6},
+            "runner_list": {"latency_ms": 100.0, "queries": 50},
+        }
+        regressions = find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(
+            all(line.startswith("archive_list") for line in regressions)
+        )
+
+    def test_sqlite_benchmark_refuses_other_databases(self) -> None:
+        name = {"NAME": "db.sqlite3"}
+        with mock.patch.dict(connection.settings_dict, name):
+            with self.assertRaises(ImproperlyConfigured):
+                run_sqlite_benchmarks(concurrency=2, requests=4)
@@ -0,0 +1,265 @@
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from event.models import (
+    Distance,
+    Event,
+    LeaderboardEntry,
+    Registration,
+    Result,
+    Runner,
+)
+
+
+class ArchiveEventsCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=timezone.now() + timedelta(days=1),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+
+    def test_started_event_is_archived(self) -> None:
+        Event.objects.filter(pk=self.event.pk).update(
+            start_datetime=timezone.now() - timedelta(minutes=1)
+        )
+        out = StringIO()
+        call_command("archive_events", stdout=out)
+        self.event.refresh_from_db()
+        self.assertFalse(self.event.is_active)
+        self.assertIn("Archived 1 event(s)", out.getvalue())
+
+    def test_rescheduled_event_is_reactivated(self) -> None:
+        Event.objects.filter(pk=self.event.pk).update(is_active=False)
+        call_command("archive_events", stdout=StringIO())
+        self.event.refresh_from_db()
+        self.assertTrue(self.event.is_active)
+
+
+class ImportRegistrationsCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=timezone.now() + timedelta(days=1),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.distance = Distance.objects.create(km=42)
+        self.event.distances.set([self.distance])
+        for number in range(3):
+            Runner.objects.create(
+                username=f"runner{number}", date_of_birth="2000-01-01"
+            )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_import(self, name: str, content: str) -> tuple[str, str]:
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding="utf-8")
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_registrations",
+            str(self.event.pk),
+            str(path),
+            "--batch-size=2",
+            stdout=out,
+            stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self) -> None:
+        out, err = self.run_import(
+            "participants.csv",
+            "username,distance\n"
+            "runner0,42\n"
+            "runner1,42\n"
+            "runner2,42\n",
+        )
+        self.assertIn("Imported 3 registration(s), 0 row(s) failed.", out)
+        self.assertEqual(err, "")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 3)
+        self.assertEqual(
+            self.event.distance_counters.get().registration_count, 3
+        )
+
+    def test_import_jsonl_reports_bad_rows(self) -> None:
+        out, err = self.run_import(
+            "participants.jsonl",
+            '{"username": "runner0", "distance": 42}\n'
+            '{"username": "runner0", "distance": 42}\n'
+            '{"username": "ghost", "distance": 42}\n'
+            '{"username": "runner1", "distance": 5}\n'
+            "not json\n",
+        )
+        self.assertIn("Imported 1 registration(s), 4 row(s) failed.", out)
+        self.assertIn("Line 2: 'runner0' is already registered", err)
+        self.assertIn("Line 3: unknown runner 'ghost'", err)
+        self.assertIn("Line 4: distance '5' is not offered", err)
+        self.assertIn("Line 5: invalid JSON", err)
+        self.assertEqual(Registration.objects.count(), 1)
+
+    def test_import_stops_at_capacity(self) -> None:
+        self.event.distance_counters.create(distance=self.distance, capacity=1)
+        out, err = self.run_import(
+            "participants.csv",
+            "username,distance\n"
+            "runner0,42\n"
+            "runner1,42\n",
+        )
+        self.assertIn("Imported 1 registration(s), 1 row(s) failed.", out)
+        self.assertIn("Line 3: There are no places left", err)
+        self.assertEqual(Registration.objects.count(), 1)
+
+
+class ImportResultsCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=timezone.now() - timedelta(days=1),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        distance = Distance.objects.create(km=42)
+        for number in range(3):
+            runner = Runner.objects.create(
+                username=f"runner{number}", date_of_birth="2000-01-01"
+            )
+            Registration.objects.create(
+                event=self.event, runner=runner, distances=distance
+            )
+        Runner.objects.create(username="spectator")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_import(self, name: str, content: str) -> tuple[str, str]:
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding="utf-8")
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_results",
+            str(self.event.pk),
+            str(path),
+            "--batch-size=2",
+            stdout=out,
+            stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv_with_splits(self) -> None:
+        out, err = self.run_import(
+            "results.csv",
+            "username,gun_time,net_time,split_10K,split_21K\n"
+            "runner0,3:01:10.5,3:00:40.5,42:00,1:29:59.9\n"
+            "runner1,3:30:00,3:29:00,50:00,\n",
+        )
+        self.assertIn("Imported 2 result(s), 0 row(s) failed.", out)
+        self.assertEqual(err, "")
+        result = Result.objects.get(registration__runner__username="runner0")
+        self.assertEqual(result.gun_time, timedelta(hours=3, seconds=70.5))
+        self.assertEqual(result.net_time, timedelta(hours=3, seconds=40.5))
+        self.assertEqual(result.splits, {"10K": 2520.0, "21K": 5399.9})
+        result = Result.objects.get(registration__runner__username="runner1")
+        self.assertEqual(result.splits, {"10K": 3000.0})
+        self.assertEqual(
+            list(
+                LeaderboardEntry.objects.filter(
+                    leaderboard__gender=""
+                ).values_list("registration__runner__username", "rank")
+            ),
+            [("runner0", 1), ("runner1", 2)],
+        )
+
+    def test_import_jsonl_reports_bad_rows(self) -> None:
+        out, err = self.run_import(
+            "results.jsonl",
+            '{"username": "runner0", "gun_time": 10900, "net_time": 10870,'
+            ' "splits": {"10K": "42:00"}}\n'
+            '{"username": "runner0", "gun_time": 10900, "net_time": 10870}\n'
+            '{"username": "spectator", "gun_time": 1, "net_time": 1}\n'
+            '{"username": "runner1", "gun_time": "DNF", "net_time": 1}\n'
+            '{"username": "runner2", "gun_time": 1, "net_time": 1,'
+            ' "splits": [1]}\n'
+            "not json\n",
+        )
+        self.assertIn("Imported 1 result(s), 5 row(s) failed.", out)
+        self.assertIn("Line 2: duplicate result for 'runner0'", err)
+        self.assertIn(
+            "Line 3: 'spectator' is not registered for this event", err
+        )
+        self.assertIn("Line 4: invalid time 'DNF'", err)
+        self.assertIn("Line 5: splits must be an object", err)
+        self.assertIn("Line 6: invalid JSON", err)
+        self.assertEqual(Result.objects.get().splits, {"10K": 2520.0})
+
+    def test_reimport_replaces_results(self) -> None:
+        self.run_import(
+            "results.csv", "username,gun_time,net_time\nrunner0,3:00,2:59\n"
+        )
+        out, _ = self.run_import(
+            "results.csv", "username,gun_time,net_time\nrunner0,3:10,3:09\n"
+        )
+        self.assertIn("Imported 1 result(s)", out)
+        result = Result.objects.get()
+        self.assertEqual(result.net_time, timedelta(minutes=3, seconds=9))
+
+
+class SeedCommandTests(TestCase):
+    def test_seeds_requested_volumes(self) -> None:
+        out = StringIO()
+        call_command(
+            "seed",
+            runners=30,
+            events=5,
+            registrations=60,
+            seed=7,
+            stdout=out,
+        )
+        self.assertEqual(Runner.objects.count(), 30)
+        self.assertEqual(Event.objects.count(), 5)
+        self.assertEqual(Registration.objects.count(), 60)
+        self.assertTrue(Distance.objects.exists())
+        self.assertIn("60 registration(s)", out.getvalue())
+        self.assertTrue(
+            Runner.objects.get(username="seed7-runner0").check_password(
+                "runner12345"
+            )
+        )
+
+    def test_pinned_now_reproduces_event_dates(self) -> None:
+        options = {"runners": 5, "events": 3, "registrations": 5}
+        dates = []
+        for _ in range(2):
+            call_command(
+                "seed", "--now=2025-01-01T00:00", stdout=StringIO(), **options
+            )
+            dates.append(
+                list(
+                    Event.objects.order_by("pk").values_list(
+                        "start_datetime", flat=True
+                    )
+                )
+            )
+            Event.objects.all().delete()
+            Runner.objects.all().delete()
+        self.assertEqual(dates[0], dates[1])
+        self.assertLess(max(dates[0]), datetime(2026, 1, 2))
+
+    def test_existing_seed_is_rejected(self) -> None:
+        options = {"runners": 5, "events": 1, "registrations": 5}
+        call_command("seed", stdout=StringIO(), **options)
+        with self.assertRaises(CommandError):
+            call_command("seed", stdout=StringIO(), **options)
@@ -1,10 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.test import AsyncRequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from event.models import Event, Distance
+from event.cache import bump_generation, get_cache_stats
+from event.models import Event, Distance, Registration
+from event.pagination import KeysetPaginator
+from event.views import (
+    AsyncArchiveListView,
+    AsyncEventDetailView,
+    AsyncEventListView,
+)
+
+EVENT_LIST_QUERY_BUDGET = 6
 
 EVENT_URL = reverse("event:index")
 ARCHIVE_URL = reverse("event:archive_list")
@@ -18,6 +34,7 @@ class PublicEventsViewsTests(TestCase):
 
 class PrivateEventsViewsTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="testuser",
             password="test123",
@@ -94,6 +111,7 @@ class PublicArchiveViewsTests(TestCase):
 
 class PrivateArchiveViewsTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="testuser",
             password="test123",
@@ -149,6 +167,12 @@ class PrivateArchiveViewsTests(TestCase):
         response = self.client.get(ARCHIVE_URL)
         self.assertTemplateUsed(response, "event/archive_list.html")
 
+    def test_archive_list_view_does_not_write(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(ARCHIVE_URL)
+        statements = [query["sql"].split()[0] for query in context]
+        self.assertNotIn("UPDATE", statements)
+
 
 class PublicEventDetailViewTests(TestCase):
     def setUp(self) -> None:
@@ -171,6 +195,7 @@ class PublicEventDetailViewTests(TestCase):
 
 class PrivateEventDetailViewTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="testuser",
             password="test123",
@@ -214,3 +239,346 @@ class PrivateEventDetailViewTests(TestCase):
     def test_event_detail_view_context(self) -> None:
         response = self.client.get(self.event_detail_url)
         self.assertEqual(response.context["event"], self.event)
+
+
+class EventListQueryBudgetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.distances = [
+            Distance.objects.create(km=km) for km in (5, 10, 21, 42)
+        ]
+        # Load the process-local distance copy before counting queries.
+        Distance.objects.get_map()
+
+    def create_events(self, count: int, start_datetime: datetime) -> None:
+        for number in range(count):
+            event = Event.objects.create(
+                name=f"Event {number}",
+                start_datetime=start_datetime,
+                location="Kyiv",
+                description="Test Description",
+                event_type="Running",
+                organiser="New Run",
+            )
+            event.distances.set(self.distances)
+            Registration.objects.create(
+                event=event, runner=self.user, distances=self.distances[0]
+            )
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_event_list_query_count_does_not_grow_with_page(self) -> None:
+        future = timezone.now() + timedelta(days=30)
+        self.create_events(1, future)
+        single = self.count_queries(EVENT_URL)
+        self.create_events(6, future)
+        full_page = self.count_queries(EVENT_URL)
+        self.assertEqual(single, full_page)
+        self.assertLessEqual(full_page, EVENT_LIST_QUERY_BUDGET)
+
+    def test_event_list_runs_no_distance_queries(self) -> None:
+        self.create_events(3, timezone.now() + timedelta(days=30))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(EVENT_URL)
+        self.assertContains(response, "42")
+        for query in context.captured_queries:
+            self.assertNotIn('"event_distance"', query["sql"])
+
+    def test_deep_page_costs_the_same_as_first_page(self) -> None:
+        self.create_events(30, timezone.now() + timedelta(days=30))
+        response = self.client.get(EVENT_URL)
+        for _ in range(2):
+            response = self.client.get(
+                f"{EVENT_URL}?{response.context['next_page_query']}"
+            )
+        deep_url = f"{EVENT_URL}?{response.context['next_page_query']}"
+        bump_generation()
+        first_page = self.count_queries(EVENT_URL)
+        deep_page = self.count_queries(deep_url)
+        self.assertEqual(first_page, deep_page)
+
+    def test_archive_list_query_count_does_not_grow_with_page(self) -> None:
+        past = datetime(2024, 7, 10, 12, 0, 0)
+        self.create_events(1, past)
+        single = self.count_queries(ARCHIVE_URL)
+        self.create_events(6, past)
+        full_page = self.count_queries(ARCHIVE_URL)
+        self.assertEqual(single, full_page)
+        self.assertLessEqual(full_page, EVENT_LIST_QUERY_BUDGET)
+
+
+class EventSearchTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        start = timezone.now() + timedelta(days=30)
+        self.kyiv = Event.objects.create(
+            name="Kyiv Marathon",
+            start_datetime=start,
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.lviv = Event.objects.create(
+            name="Lviv Half Marathon Night Race",
+            start_datetime=start,
+            location="Lviv",
+            description="Test Description",
+            event_type="Running",
+            organiser="Run Ukraine",
+        )
+
+    def search(self, **params: str) -> list[Event]:
+        response = self.client.get(EVENT_URL, params)
+        return list(response.context["events"])
+
+    def test_search_by_name_and_location(self) -> None:
+        self.assertEqual(
+            self.search(name="marathon", location="kyiv"), [self.kyiv]
+        )
+
+    def test_search_matches_word_prefix(self) -> None:
+        self.assertEqual(self.search(name="nig"), [self.lviv])
+
+    def test_search_ranks_by_relevance(self) -> None:
+        self.assertEqual(
+            self.search(name="marathon"), [self.kyiv, self.lviv]
+        )
+
+    def test_search_index_follows_updates(self) -> None:
+        self.kyiv.name = "Kyiv Trail"
+        self.kyiv.save()
+        self.assertEqual(self.search(name="marathon"), [self.lviv])
+        self.assertEqual(self.search(name="trail"), [self.kyiv])
+
+    def test_search_ignores_punctuation_only_input(self) -> None:
+        self.assertEqual(len(self.search(name='"*')), 2)
+
+
+class EventListPaginationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        start = timezone.now() + timedelta(days=30)
+        self.events = [
+            Event.objects.create(
+                name=f"Event {number}",
+                start_datetime=start + timedelta(days=number // 2),
+                location="Kyiv",
+                description="Test Description",
+                event_type="Running" if number % 2 else "Cycling",
+                organiser="New Run",
+            )
+            for number in range(16)
+        ]
+
+    def test_next_pages_walk_all_events_in_order(self) -> None:
+        seen = []
+        response = self.client.get(EVENT_URL)
+        seen += response.context["events"]
+        while "next_page_query" in response.context:
+            response = self.client.get(
+                f"{EVENT_URL}?{response.context['next_page_query']}"
+            )
+            seen += response.context["events"]
+        self.assertEqual(seen, self.events)
+
+    def test_previous_page_returns_to_first_page(self) -> None:
+        first = self.client.get(EVENT_URL)
+        second = self.client.get(
+            f"{EVENT_URL}?{first.context['next_page_query']}"
+        )
+        back = self.client.get(
+            f"{EVENT_URL}?{second.context['previous_page_query']}"
+        )
+        self.assertEqual(
+            list(back.context["events"]), list(first.context["events"])
+        )
+        self.assertNotIn("previous_page_query", back.context)
+
+    def test_cursor_keeps_filters(self) -> None:
+        response = self.client.get(EVENT_URL, {"event_type": "Running"})
+        response = self.client.get(
+            f"{EVENT_URL}?{response.context['next_page_query']}"
+        )
+        self.assertEqual(
+            list(response.context["events"]),
+            [event for event in self.events if event.event_type == "Running"][
+                7:
+            ],
+        )
+
+    def test_invalid_cursor_falls_back_to_first_page(self) -> None:
+        response = self.client.get(EVENT_URL, {"cursor": "garbage"})
+        self.assertEqual(list(response.context["events"]), self.events[:7])
+
+    def test_stale_cursor_falls_back_to_first_page(self) -> None:
+        first = self.client.get(EVENT_URL)
+        query = first.context["next_page_query"]
+        Event.objects.filter(pk__in=[e.pk for e in self.events[7:]]).delete()
+        response = self.client.get(f"{EVENT_URL}?{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["events"]), self.events[:7])
+        self.assertNotIn("next_page_query", response.context)
+
+    def test_first_page_skips_count_query(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(EVENT_URL)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in context)
+        )
+
+
+class EventListFragmentCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=timezone.now() + timedelta(days=30),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+
+    def test_repeated_request_is_served_from_cache(self) -> None:
+        self.client.get(EVENT_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(EVENT_URL)
+        self.assertContains(response, "Marathon")
+        self.assertFalse(
+            any("event_event" in query["sql"] for query in context)
+        )
+        self.assertEqual(
+            get_cache_stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+        )
+
+    def test_event_change_invalidates_cache(self) -> None:
+        self.client.get(EVENT_URL)
+        self.event.name = "Night Run"
+        self.event.save()
+        self.assertContains(self.client.get(EVENT_URL), "Night Run")
+
+    def test_registration_change_invalidates_cache(self) -> None:
+        distance = Distance.objects.create(km=42)
+        self.client.get(EVENT_URL)
+        Registration.objects.create(
+            event=self.event, runner=self.user, distances=distance
+        )
+        self.assertContains(self.client.get(EVENT_URL), "Participants: 1")
+
+    def test_staff_and_runners_get_separate_fragments(self) -> None:
+        self.client.get(EVENT_URL)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(EVENT_URL)
+        self.assertContains(response, "Update")
+
+
+class AsyncEventViewsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.factory = AsyncRequestFactory()
+        start = timezone.now() + timedelta(days=30)
+        self.events = [
+            Event.objects.create(
+                name=f"Race {number:02d}",
+                start_datetime=start + timedelta(days=number),
+                location="Kyiv",
+                description="Test Description",
+                event_type="Running",
+                organiser="New Run",
+            )
+            for number in range(9)
+        ]
+        self.past_event = Event.objects.create(
+            name="Finished Race",
+            start_datetime=timezone.now() - timedelta(days=3),
+            location="Lviv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+
+    async def get(
+        self, view: type, data: dict | None = None, **kwargs: dict
+    ) -> HttpResponse:
+        request = self.factory.get("/", data or {})
+        request.user = self.user
+        response = await view.as_view()(request, **kwargs)
+        if hasattr(response, "render"):
+            await sync_to_async(response.render)()
+        return response
+
+    async def test_event_list_pages_with_cursor(self) -> None:
+        first = (await self.get(AsyncEventListView)).content.decode()
+        cursor = KeysetPaginator(Event.objects.all(), 7).encode_cursor(
+            self.events[6], "next"
+        )
+        second = (
+            await self.get(AsyncEventListView, {"cursor": cursor})
+        ).content.decode()
+
+        for event in self.events[:7]:
+            self.assertIn(event.name, first)
+            self.assertNotIn(event.name, second)
+        for event in self.events[7:]:
+            self.assertNotIn(event.name, first)
+            self.assertIn(event.name, second)
+        self.assertNotIn(self.past_event.name, first)
+
+    async def test_search_uses_offset_pages(self) -> None:
+        response = await self.get(
+            AsyncEventListView, {"name": "race", "page": 2}
+        )
+        content = response.content.decode()
+        self.assertIn(self.events[7].name, content)
+        self.assertNotIn(self.events[0].name, content)
+
+    async def test_archive_list(self) -> None:
+        response = await self.get(AsyncArchiveListView)
+        self.assertContains(response, self.past_event.name)
+        self.assertNotContains(response, self.events[0].name)
+
+    async def test_event_detail(self) -> None:
+        response = await self.get(AsyncEventDetailView, pk=self.events[0].pk)
+        self.assertContains(response, self.events[0].name)
+        with self.assertRaises(Http404):
+            await self.get(AsyncEventDetailView, pk=0)
+
+    async def test_login_required(self) -> None:
+        self.user = AnonymousUser()
+        response = await self.get(AsyncEventListView)
+        self.assertEqual(response.status_code, 302)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from event.forms import (
@@ -145,3 +147,99 @@ class RegistrationFormTests(TestCase):
             list(form.fields["distances"].queryset),
             list(self.event.distances.all())
         )
+
+
+class CachedDistanceChoicesTests(TestCase):
+    def setUp(self) -> None:
+        self.five = Distance.objects.create(km=5)
+        self.ten = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=timezone.now(),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.event.distances.add(self.ten)
+        Distance.objects.get_map()
+
+    def assert_no_distance_queries(self, render: object) -> None:
+        with CaptureQueriesContext(connection) as context:
+            render()
+        for query in context.captured_queries:
+            self.assertNotIn('"event_distance"', query["sql"])
+
+    def test_forms_render_without_distance_queries(self) -> None:
+        event = Event.objects.with_cached_distances().get(pk=self.event.pk)
+        self.assert_no_distance_queries(lambda: str(EventCreationForm()))
+        self.assert_no_distance_queries(
+            lambda: str(EventCreationForm(instance=event))
+        )
+        self.assert_no_distance_queries(
+            lambda: str(RegistrationForm(event_id=self.event.id))
+        )
+
+    def test_registration_form_offers_event_distances_only(self) -> None:
+        form = RegistrationForm(
+            data={"distances": self.five.pk}, event_id=self.event.id
+        )
+        self.assertEqual(
+            [label for _, label in form.fields["distances"].choices],
+            ["10 km"],
+        )
+        self.assertFalse(form.is_valid())
+        form = RegistrationForm(
+            data={"distances": self.ten.pk}, event_id=self.event.id
+        )
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["distances"], self.ten)
+
+    def test_event_form_saves_cached_distances(self) -> None:
+        form = EventCreationForm(
+            data={
+                "name": "Trail",
+                "start_datetime": "2030-01-01T09:00",
+                "location": "Lviv",
+                "description": "Hills",
+                "event_type": "Running",
+                "organiser": "New Run",
+                "distances": [self.five.pk, self.ten.pk, self.five.pk],
+            }
+        )
+        self.assertTrue(form.is_valid())
+        event = form.save()
+        self.assertEqual(event.get_distances(), [5, 10])
+        self.assertFalse(
+            EventCreationForm(data={"distances": ["999"]}).is_valid()
+        )
+
+    def test_event_form_edits_cached_distances(self) -> None:
+        event = Event.objects.with_cached_distances().get(pk=self.event.pk)
+        form = EventCreationForm(instance=event)
+        self.assertEqual(form.initial["distances"], [self.ten.pk])
+        self.assertEqual(
+            list(form.fields)[:4],
+            ["name", "start_datetime", "location", "distances"],
+        )
+        data = {
+            "name": event.name,
+            "start_datetime": "2030-01-01T09:00",
+            "location": event.location,
+            "description": event.description,
+            "event_type": event.event_type,
+            "organiser": event.organiser,
+            "distances": [self.five.pk],
+        }
+        form = EventCreationForm(data=data, instance=event)
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(event.get_distances(), [5])
+        self.assertEqual(list(self.event.distances.all()), [self.five])
+
+    def test_new_distance_invalidates_cache(self) -> None:
+        Distance.objects.create(km=42)
+        choices = EventCreationForm().fields["distances"].choices
+        self.assertEqual(
+            [label for _, label in choices], ["5 km", "10 km", "42 km"]
+        )
@@ -0,0 +1,77 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from django.views import View
+
+from event.models import Event, Registration, Runner
+from event.views import (
+    ArchiveListView,
+    EventListView,
+    EventRegistrationListView,
+    MyRegistrationsView,
+)
+
+
+@skipUnless(connection.vendor == "sqlite", "Plans are SQLite specific")
+class QueryPlanTests(TestCase):
+    def setUp(self) -> None:
+        self.runner = Runner.objects.create(
+            username="runner", date_of_birth="2000-01-01"
+        )
+
+    def get_view_queryset(
+        self, view_class: type[View], url: str, **kwargs: dict
+    ) -> QuerySet:
+        request = RequestFactory().get(url)
+        request.user = self.runner
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view.get_queryset()
+
+    def assert_uses_index(self, queryset: QuerySet, index_name: str) -> None:
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+
+    def test_event_list_uses_active_index(self) -> None:
+        queryset = self.get_view_queryset(EventListView, "/")
+        self.assert_uses_index(queryset, "event_active_start_idx")
+
+    def test_event_list_by_type_uses_type_index(self) -> None:
+        queryset = self.get_view_queryset(
+            EventListView, "/?event_type=Running"
+        )
+        self.assert_uses_index(queryset, "event_type_start_idx")
+
+    def test_archive_list_uses_archived_index(self) -> None:
+        queryset = self.get_view_queryset(ArchiveListView, "/archive/")
+        self.assert_uses_index(queryset, "event_archived_start_idx")
+
+    def test_participant_list_uses_event_distance_index(self) -> None:
+        queryset = self.get_view_queryset(
+            EventRegistrationListView, "/", pk=1
+        )
+        self.assert_uses_index(queryset, "registration_event_dist_idx")
+
+    def test_my_registrations_uses_runner_event_index(self) -> None:
+        queryset = self.get_view_queryset(MyRegistrationsView, "/")
+        self.assert_uses_index(queryset, "registration_runner_event_idx")
+
+    def test_lifecycle_updates_use_partial_indexes(self) -> None:
+        now = timezone.now()
+        self.assert_uses_index(
+            Event.objects.filter(is_active=True, start_datetime__lte=now),
+            "event_active_start_idx",
+        )
+        self.assert_uses_index(
+            Event.objects.filter(is_active=False, start_datetime__gt=now),
+            "event_archived_start_idx",
+        )
+
+    def test_duplicate_check_uses_unique_index(self) -> None:
+        plan = Registration.objects.filter(
+            event_id=1, runner=self.runner
+        ).explain()
+        self.assertIn("event_id=? AND runner_id=?", plan)
@@ -0,0 +1,217 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from event.leaderboards import rebuild_leaderboards
+from event.models import (
+    Distance,
+    Event,
+    Leaderboard,
+    LeaderboardEntry,
+    Registration,
+    Result,
+    Runner,
+)
+
+RUNNERS = [
+    ("anna", "Female", 25, 50),
+    ("olha", "Female", 62, 45),
+    ("ivan", "Male", 25, 45),
+    ("petro", "Male", 25, 40),
+]
+
+
+def born(age: int) -> date:
+    return date.today() - timedelta(days=age * 365 + 30)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Night Run",
+            start_datetime=timezone.now() - timedelta(days=1),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.distance = Distance.objects.create(km=10)
+        self.other_distance = Distance.objects.create(km=5)
+        self.registrations = {}
+        for username, gender, age, minutes in RUNNERS:
+            runner = Runner.objects.create(
+                username=username,
+                first_name=username.title(),
+                gender=gender,
+                date_of_birth=born(age),
+            )
+            registration = Registration.objects.create(
+                event=self.event, runner=runner, distances=self.distance
+            )
+            Result.objects.create(
+                registration=registration,
+                gun_time=timedelta(minutes=minutes),
+                net_time=timedelta(minutes=minutes),
+            )
+            self.registrations[username] = registration
+
+    def board(
+        self, gender: str = "", category: str = "", distance: int = None
+    ) -> list[tuple[str, int]]:
+        return list(
+            LeaderboardEntry.objects.filter(
+                leaderboard__event=self.event,
+                leaderboard__distance=distance or self.distance,
+                leaderboard__gender=gender,
+                leaderboard__age_category=category,
+            )
+            .order_by("net_time", "registration__runner__username")
+            .values_list("registration__runner__username", "rank")
+        )
+
+    def snapshot(self) -> list[tuple]:
+        return list(
+            LeaderboardEntry.objects.order_by(
+                "leaderboard__distance",
+                "leaderboard__gender",
+                "leaderboard__age_category",
+                "registration",
+            ).values_list(
+                "leaderboard__distance",
+                "leaderboard__gender",
+                "leaderboard__age_category",
+                "registration",
+                "net_time",
+                "rank",
+            )
+        )
+
+    def assert_matches_rebuild(self) -> None:
+        incremental = self.snapshot()
+        sizes = list(
+            Leaderboard.objects.filter(size__gt=0)
+            .order_by("distance", "gender", "age_category")
+            .values_list("distance", "gender", "age_category", "size")
+        )
+        rebuild_leaderboards(self.event.pk)
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(
+            sizes,
+            list(
+                Leaderboard.objects.order_by(
+                    "distance", "gender", "age_category"
+                ).values_list("distance", "gender", "age_category", "size")
+            ),
+        )
+
+    def test_rebuild_ranks_ties_together(self) -> None:
+        self.assertEqual(rebuild_leaderboards(self.event.pk), 4)
+        self.assertEqual(
+            self.board(),
+            [("petro", 1), ("ivan", 2), ("olha", 2), ("anna", 4)],
+        )
+        self.assertEqual(self.board("Female"), [("olha", 1), ("anna", 2)])
+        self.assertEqual(self.board("Female", "FSEN"), [("anna", 1)])
+        self.assertEqual(
+            self.board("Male", "MSEN"), [("petro", 1), ("ivan", 2)]
+        )
+
+    def test_new_result_is_ranked(self) -> None:
+        runner = Runner.objects.create(
+            username="taras", gender="Male", date_of_birth=born(25)
+        )
+        registration = Registration.objects.create(
+            event=self.event, runner=runner, distances=self.distance
+        )
+        Result.objects.create(
+            registration=registration,
+            gun_time=timedelta(minutes=45),
+            net_time=timedelta(minutes=45),
+        )
+        self.assertEqual(
+            self.board(),
+            [
+                ("petro", 1),
+                ("ivan", 2),
+                ("olha", 2),
+                ("taras", 2),
+                ("anna", 5),
+            ],
+        )
+        self.assert_matches_rebuild()
+
+    def test_changed_time_moves_the_runner(self) -> None:
+        result = self.registrations["anna"].result
+        result.net_time = timedelta(minutes=39)
+        result.save()
+        self.assertEqual(
+            self.board(),
+            [("anna", 1), ("petro", 2), ("ivan", 3), ("olha", 3)],
+        )
+        self.assert_matches_rebuild()
+
+    def test_changed_distance_moves_the_runner(self) -> None:
+        registration = self.registrations["petro"]
+        registration.distances = self.other_distance
+        registration.save()
+        self.assertEqual(
+            self.board(), [("ivan", 1), ("olha", 1), ("anna", 3)]
+        )
+        self.assertEqual(
+            self.board(distance=self.other_distance), [("petro", 1)]
+        )
+        self.assert_matches_rebuild()
+
+    def test_deleted_registration_leaves_the_boards(self) -> None:
+        self.registrations["ivan"].delete()
+        self.assertEqual(
+            self.board(), [("petro", 1), ("olha", 2), ("anna", 3)]
+        )
+        self.assertEqual(self.board("Male"), [("petro", 1)])
+        self.assert_matches_rebuild()
+
+    def test_deleted_event_removes_its_boards(self) -> None:
+        self.event.delete()
+        self.assertFalse(Leaderboard.objects.exists())
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_refresh_command_rebuilds_boards(self) -> None:
+        Runner.objects.filter(username="anna").update(gender="Male")
+        out = StringIO()
+        call_command("refresh_leaderboards", stdout=out)
+        self.assertIn(
+            f"Event {self.event.pk}: ranked 4 result(s).", out.getvalue()
+        )
+        self.assertEqual(self.board("Female"), [("olha", 1)])
+
+    def test_view_pages_through_one_board(self) -> None:
+        self.client.force_login(self.registrations["anna"].runner)
+        url = reverse("event:leaderboard", kwargs={"pk": self.event.pk})
+        with self.assertNumQueries(6):
+            response = self.client.get(url, {"gender": "Male"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["leaderboard"].gender, "Male")
+        self.assertEqual(
+            [
+                entry.registration.runner.username
+                for entry in response.context["entries"]
+            ],
+            ["petro", "ivan"],
+        )
+        self.assertContains(response, "Overall")
+        self.assertContains(response, "10 км")
+        self.assertNotContains(response, "km км")
+
+    def test_view_without_results(self) -> None:
+        Result.objects.all().delete()
+        self.client.force_login(self.registrations["anna"].runner)
+        response = self.client.get(
+            reverse("event:leaderboard", kwargs={"pk": self.event.pk})
+        )
+        self.assertContains(
+            response, "There are no results for this event yet."
+        )
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from event.metrics import QUERY_COUNT, REQUEST_DURATION
+
+METRICS_URL = "/metrics"
+METRICS_AUTH = {"HTTP_AUTHORIZATION": "Bearer scrape-token"}
+
+
+@override_settings(METRICS_TOKEN="scrape-token")
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+        )
+        self.client.force_login(self.user)
+
+    def test_request_is_recorded_per_view(self) -> None:
+        self.client.get(reverse("events:index"))
+        self.assertIn("events:index", REQUEST_DURATION.series)
+        counts, total = QUERY_COUNT.series["events:index"]
+        self.assertGreater(sum(counts), 0)
+        self.assertGreater(total, 0)
+
+    async def test_async_request_is_recorded(self) -> None:
+        await sync_to_async(self.async_client.force_login)(self.user)
+        counts, total = QUERY_COUNT.series.get("events:archive_list", ([], 0))
+        requests, queries = sum(counts), total
+        await self.async_client.get(reverse("events:archive_list"))
+        counts, total = QUERY_COUNT.series["events:archive_list"]
+        self.assertEqual(sum(counts), requests + 1)
+        self.assertGreater(total, queries)
+
+    def test_metrics_endpoint_exposes_histograms(self) -> None:
+        self.client.get(reverse("events:index"))
+        response = self.client.get(METRICS_URL, **METRICS_AUTH)
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'db_queries_per_request_count{view="events:index"}', body
+        )
+        self.assertIn("event_list_cache_hits_total", body)
+
+    def test_metrics_endpoint_is_not_recorded(self) -> None:
+        self.client.get(METRICS_URL, **METRICS_AUTH)
+        self.assertNotIn("metrics", REQUEST_DURATION.series)
+
+    def test_metrics_forbidden_outside_allowed_ips(self) -> None:
+        response = self.client.get(METRICS_URL, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_forbidden_from_local_proxy(self) -> None:
+        response = self.client.get(METRICS_URL, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_forbidden_with_wrong_token(self) -> None:
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer guess"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_allowed_ips_can_read_metrics(self) -> None:
+        response = self.client.get(METRICS_URL, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 200)
+
+    def test_staff_can_read_metrics_from_anywhere(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(METRICS_URL, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 200)
@@ -2,7 +2,13 @@ from datetime import datetime, date, timedelta
 from django.utils import timezone
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from event.models import Runner, Distance, Event, Registration
+from event.models import (
+    Runner,
+    Distance,
+    Event,
+    Registration,
+    EventDistanceCounter,
+)
 
 
 class ModelsTests(TestCase):
@@ -192,3 +198,120 @@ class ModelsTests(TestCase):
             str(registration),
             f"{runner.last_name} {runner.first_name} - {event.name}"
         )
+
+
+class RegistrationCounterTests(TestCase):
+    def setUp(self) -> None:
+        self.distance1 = Distance.objects.create(km=10)
+        self.distance2 = Distance.objects.create(km=21)
+        self.event = Event.objects.create(
+            name="Test",
+            start_datetime=datetime(2024, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            event_type="Running",
+            organiser="NewRun",
+        )
+        self.event.distances.add(self.distance1, self.distance2)
+        self.runner = Runner.objects.create(
+            username="runner",
+            date_of_birth=date(2000, 1, 1),
+        )
+
+    def get_counts(self) -> tuple:
+        self.event.refresh_from_db()
+        return self.event.registration_count, dict(
+            EventDistanceCounter.objects.filter(event=self.event)
+            .values_list("distance__km", "registration_count")
+        )
+
+    def test_counters_follow_created_registration(self) -> None:
+        Registration.objects.create(
+            event=self.event, runner=self.runner, distances=self.distance1
+        )
+        self.assertEqual(self.get_counts(), (1, {10: 1}))
+
+    def test_counters_follow_moved_registration(self) -> None:
+        Registration.objects.create(
+            event=self.event, runner=self.runner, distances=self.distance1
+        )
+        registration = Registration.objects.get(runner=self.runner)
+        registration.distances = self.distance2
+        registration.save()
+        self.assertEqual(self.get_counts(), (1, {10: 0, 21: 1}))
+
+    def test_counters_follow_deleted_registration(self) -> None:
+        registration = Registration.objects.create(
+            event=self.event, runner=self.runner, distances=self.distance1
+        )
+        registration.delete()
+        self.assertEqual(self.get_counts(), (0, {10: 0}))
+
+    def test_counters_follow_cascade_delete(self) -> None:
+        Registration.objects.create(
+            event=self.event, runner=self.runner, distances=self.distance1
+        )
+        self.runner.delete()
+        self.assertEqual(self.get_counts(), (0, {10: 0}))
+
+
+class AgeAnnotationTests(TestCase):
+    def setUp(self) -> None:
+        self.distance = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Test",
+            start_datetime=datetime(2030, 6, 15, 9, 0, 0),
+            location="Kyiv",
+            event_type="Running",
+            organiser="NewRun",
+        )
+
+    def register(self, username: str, birth_date: date, gender: str) -> None:
+        runner = Runner.objects.create(
+            username=username, date_of_birth=birth_date, gender=gender
+        )
+        Registration.objects.create(
+            event=self.event, runner=runner, distances=self.distance
+        )
+
+    def test_age_at_race_day(self) -> None:
+        self.register("birthday", date(1995, 6, 15), "Male")
+        self.register("tomorrow", date(1995, 6, 16), "Female")
+        ages = dict(
+            Registration.objects.with_age().values_list(
+                "runner__username", "age"
+            )
+        )
+        self.assertEqual(ages, {"birthday": 35, "tomorrow": 34})
+
+    def test_age_categories(self) -> None:
+        self.register("junior", date(2012, 1, 1), "Female")
+        self.register("senior", date(2000, 1, 1), "Male")
+        self.register("master", date(1988, 1, 1), "Female")
+        self.register("veteran", date(1975, 1, 1), "Male")
+        categories = dict(
+            Registration.objects.with_age().values_list(
+                "runner__username", "age_category"
+            )
+        )
+        self.assertEqual(
+            categories,
+            {
+                "junior": "FU20",
+                "senior": "MSEN",
+                "master": "F40",
+                "veteran": "M55",
+            },
+        )
+
+    def test_runner_age_on_date(self) -> None:
+        Runner.objects.create(
+            username="runner", date_of_birth=date(1990, 3, 1), gender="Male"
+        )
+        runner = Runner.objects.with_age(date(2030, 2, 28)).get()
+        self.assertEqual((runner.age, runner.age_category), (39, "M35"))
+
+    def test_missing_birth_date_has_no_category(self) -> None:
+        Runner.objects.create(username="runner", gender="Male")
+        runner = Runner.objects.with_age().get()
+        self.assertIsNone(runner.age)
+        self.assertIsNone(runner.age_category)
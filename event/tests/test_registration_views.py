@@ -1,10 +1,23 @@
+import json
+import threading
+from collections import Counter
 from datetime import datetime
+from unittest import mock
 
+from django import db
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import IntegrityError, connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from event.models import Runner, Registration, Event, Distance
+from event.models import (
+    Distance,
+    Event,
+    EventDistanceCounter,
+    Registration,
+    Runner,
+)
 
 
 class PublicRegistrationsViewsTests(TestCase):
@@ -78,8 +91,318 @@ class PrivateRegistrationsViewsTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Marathon")
 
+    def test_filter_by_age_category(self) -> None:
+        url = reverse("event:registration_list", kwargs={"pk": self.event.pk})
+        response = self.client.get(url, {"category": "MSEN"})
+        self.assertEqual(len(response.context["registrations"]), 2)
+        response = self.client.get(url, {"category": "M40"})
+        self.assertEqual(len(response.context["registrations"]), 0)
+
     def test_runner_list_view_template_used(self) -> None:
         response = self.client.get(
             reverse("event:registration_list", kwargs={"pk": self.event.pk})
         )
         self.assertTemplateUsed(response, "event/registration_list.html")
+
+
+class RegistrationCreateViewTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.distance = Distance.objects.create(km=42)
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=datetime(2030, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.event.distances.set([self.distance])
+        self.url = reverse(
+            "event:registration_create", kwargs={"event_id": self.event.pk}
+        )
+
+    def test_create_registration(self) -> None:
+        response = self.client.post(self.url, {"distances": self.distance.pk})
+        self.assertRedirects(
+            response, reverse("event:my_registrations_list")
+        )
+        self.assertTrue(
+            Registration.objects.filter(
+                event=self.event, runner=self.user
+            ).exists()
+        )
+
+    def test_duplicate_registration_rejected(self) -> None:
+        self.client.post(self.url, {"distances": self.distance.pk})
+        response = self.client.post(
+            self.url, {"distances": self.distance.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, "You are already registered for this event."
+        )
+        self.assertEqual(
+            Registration.objects.filter(
+                event=self.event, runner=self.user
+            ).count(),
+            1,
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
+
+    def test_other_integrity_errors_are_not_hidden(self) -> None:
+        error = IntegrityError("FOREIGN KEY constraint failed")
+        with mock.patch.object(Registration, "save", side_effect=error):
+            with self.assertRaises(IntegrityError):
+                self.client.post(self.url, {"distances": self.distance.pk})
+
+
+class RegistrationIdentityMapTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="test123"
+        )
+        self.client.force_login(self.user)
+        self.five = Distance.objects.create(km=5)
+        self.ten = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=datetime(2030, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            event_type="Running",
+        )
+        self.event.distances.set([self.five, self.ten])
+        self.create_url = reverse(
+            "event:registration_create", kwargs={"event_id": self.event.pk}
+        )
+
+    def count_selects(self, request: object) -> Counter:
+        with CaptureQueriesContext(connection) as context:
+            request()
+        return Counter(
+            table
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+            for table in ("event_event", "event_registration")
+            if f'FROM "{table}"' in query["sql"]
+        )
+
+    def test_create_loads_event_once(self) -> None:
+        selects = self.count_selects(
+            lambda: self.client.post(
+                self.create_url, {"distances": self.five.pk}
+            )
+        )
+        self.assertEqual(selects["event_event"], 1)
+        self.assertTrue(Registration.objects.filter(event=self.event))
+
+    def test_update_loads_registration_and_event_once(self) -> None:
+        registration = Registration.objects.create(
+            event=self.event, runner=self.user, distances=self.five
+        )
+        url = reverse(
+            "event:registration_update", kwargs={"pk": registration.pk}
+        )
+        # Warm the cached user context, which checks for registrations.
+        self.client.get(url)
+        for selects in (
+            self.count_selects(lambda: self.client.get(url)),
+            self.count_selects(
+                lambda: self.client.post(url, {"distances": self.ten.pk})
+            ),
+        ):
+            self.assertEqual(
+                selects, {"event_event": 1, "event_registration": 1}
+            )
+        registration.refresh_from_db()
+        self.assertEqual(registration.distances, self.ten)
+
+    def test_missing_event_is_404(self) -> None:
+        url = reverse("event:registration_create", kwargs={"event_id": 999})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class EventRegistrationExportViewTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=datetime(2030, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.distance = Distance.objects.create(km=42)
+        for number in range(3):
+            runner = Runner.objects.create(
+                username=f"runner{number}",
+                first_name=f"First {number}",
+                last_name=f"Last {number}",
+                city="Kyiv",
+                date_of_birth="2000-01-01",
+                gender="Male",
+            )
+            Registration.objects.create(
+                event=self.event, runner=runner, distances=self.distance
+            )
+
+    def get_export(self, export_format: str) -> list[str]:
+        url = reverse(
+            "event:registration_export",
+            kwargs={"pk": self.event.pk, "export_format": export_format},
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        return content.splitlines()
+
+    def test_csv_export(self) -> None:
+        lines = self.get_export("csv")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("distance_km,last_name"))
+        self.assertTrue(lines[1].startswith("42,Last 0,First 0,runner0"))
+
+    def test_jsonl_export(self) -> None:
+        rows = [json.loads(line) for line in self.get_export("jsonl")]
+        self.assertEqual(
+            [row["username"] for row in rows],
+            ["runner0", "runner1", "runner2"],
+        )
+        self.assertEqual(rows[0]["date_of_birth"], "2000-01-01")
+
+    def test_export_runs_one_registration_query(self) -> None:
+        url = reverse(
+            "event:registration_export",
+            kwargs={"pk": self.event.pk, "export_format": "csv"},
+        )
+        response = self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            b"".join(response.streaming_content)
+        self.assertEqual(len(context), 1)
+
+    def test_unknown_format_returns_404(self) -> None:
+        url = reverse(
+            "event:registration_export",
+            kwargs={"pk": self.event.pk, "export_format": "xml"},
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class RegistrationCapacityTests(TestCase):
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=datetime(2030, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.distance = Distance.objects.create(km=42)
+        self.event.distances.add(self.distance)
+        EventDistanceCounter.objects.create(
+            event=self.event, distance=self.distance, capacity=1
+        )
+        self.url = reverse(
+            "event:registration_create", kwargs={"event_id": self.event.pk}
+        )
+
+    def register(self, username: str) -> object:
+        runner = Runner.objects.create_user(
+            username=username, password="test12345"
+        )
+        self.client.force_login(runner)
+        return self.client.post(self.url, {"distances": self.distance.pk})
+
+    def test_full_distance_rejects_registration(self) -> None:
+        self.assertEqual(self.register("first").status_code, 302)
+        response = self.register("second")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "There are no places left")
+        self.assertEqual(Registration.objects.count(), 1)
+        counter = EventDistanceCounter.objects.get()
+        self.assertEqual(counter.registration_count, 1)
+        self.assertEqual(counter.places_left, 0)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
+
+    def test_cancelled_place_can_be_taken(self) -> None:
+        self.register("first")
+        Registration.objects.get().delete()
+        self.assertEqual(self.register("second").status_code, 302)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    registrants = 40
+    capacity = 15
+
+    def setUp(self) -> None:
+        self.event = Event.objects.create(
+            name="Marathon",
+            start_datetime=datetime(2030, 10, 10, 12, 0, 0),
+            location="Kyiv",
+            description="Test Description",
+            event_type="Running",
+            organiser="New Run",
+        )
+        self.distance = Distance.objects.create(km=42)
+        self.event.distances.add(self.distance)
+        EventDistanceCounter.objects.create(
+            event=self.event, distance=self.distance, capacity=self.capacity
+        )
+        self.runners = [
+            Runner.objects.create(username=f"runner{number}")
+            for number in range(self.registrants)
+        ]
+
+    def test_parallel_registrants_never_oversell(self) -> None:
+        url = reverse(
+            "event:registration_create", kwargs={"event_id": self.event.pk}
+        )
+        # Every runner submits the form twice at the same moment.
+        clients = []
+        for runner in self.runners * 2:
+            client = Client()
+            client.force_login(runner)
+            clients.append(client)
+        start = threading.Barrier(len(clients), timeout=30)
+
+        def register(client: Client) -> None:
+            try:
+                start.wait()
+                client.post(url, {"distances": self.distance.pk})
+            finally:
+                db.connections.close_all()
+
+        threads = [
+            threading.Thread(target=register, args=(client,))
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counter = EventDistanceCounter.objects.get()
+        self.assertEqual(Registration.objects.count(), self.capacity)
+        self.assertEqual(counter.registration_count, self.capacity)
+        self.assertEqual(
+            Registration.objects.values("runner").distinct().count(),
+            self.capacity,
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, self.capacity)
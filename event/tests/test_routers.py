@@ -0,0 +1,188 @@
+import time
+from datetime import datetime
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpRequest, HttpResponse
+from django.template import engines
+from django.template.response import SimpleTemplateResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.connection import ConnectionDoesNotExist
+from django.views import generic
+
+from event.cache import get_fragment_key, set_fragment
+from event.models import Distance, Event
+from event.routers import (
+    PRIMARY_PIN_KEY,
+    ReplicaReadMixin,
+    ReplicaRouter,
+    pin_to_primary,
+    replica_reads,
+)
+from event.views import (
+    ArchiveListView,
+    AsyncEventListView,
+    EventListView,
+    EventRegistrationListView,
+    RunnerDetailView,
+    RunnerListView,
+)
+
+REPLICAS = override_settings(DATABASE_REPLICAS=["replica_1"])
+
+
+class ProbeView(ReplicaReadMixin, generic.View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(router.db_for_read(Event))
+
+
+class DeferredProbeView(ReplicaReadMixin, generic.View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        return SimpleTemplateResponse(
+            engines["django"].from_string("{{ db }}"),
+            {"db": lambda: router.db_for_read(Event)},
+        )
+
+
+class AsyncProbeView(ReplicaReadMixin, generic.View):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(router.db_for_read(Event))
+
+
+def make_request(pinned: bool = False) -> HttpRequest:
+    request = RequestFactory().get("/")
+    request.session = SessionStore()
+    if pinned:
+        pin_to_primary(request)
+    return request
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+
+    def test_reads_use_primary_outside_replica_views(self) -> None:
+        with REPLICAS:
+            self.assertIsNone(self.router.db_for_read(Event))
+
+    def test_replica_reads_without_replicas_use_primary(self) -> None:
+        with replica_reads():
+            self.assertIsNone(self.router.db_for_read(Event))
+
+    @REPLICAS
+    def test_replica_reads(self) -> None:
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Event), "replica_1")
+            self.assertEqual(self.router.db_for_read(Session), "default")
+            self.assertEqual(self.router.db_for_write(Event), "default")
+
+    @REPLICAS
+    def test_migrations_skip_replicas(self) -> None:
+        self.assertTrue(self.router.allow_migrate("default", "event"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "event"))
+
+
+@REPLICAS
+class ReplicaReadMixinTests(TestCase):
+    def test_view_reads_from_replica(self) -> None:
+        response = ProbeView.as_view()(make_request())
+        self.assertEqual(response.content, b"replica_1")
+
+    def test_template_renders_from_replica(self) -> None:
+        response = DeferredProbeView.as_view()(make_request())
+        self.assertEqual(response.render().content, b"replica_1")
+
+    def test_async_view_reads_from_replica(self) -> None:
+        request = AsyncRequestFactory().get("/")
+        request.session = SessionStore()
+        response = async_to_sync(AsyncProbeView.as_view())(request)
+        self.assertEqual(response.content, b"replica_1")
+
+    def test_pinned_session_reads_from_primary(self) -> None:
+        response = ProbeView.as_view()(make_request(pinned=True))
+        self.assertEqual(response.content, b"default")
+
+    def test_expired_pin_reads_from_replica(self) -> None:
+        request = make_request(pinned=True)
+        request.session[PRIMARY_PIN_KEY] = 0
+        response = ProbeView.as_view()(request)
+        self.assertEqual(response.content, b"replica_1")
+
+    def test_event_browsing_views_read_from_replicas(self) -> None:
+        for view in (
+            EventListView,
+            ArchiveListView,
+            AsyncEventListView,
+            RunnerListView,
+            RunnerDetailView,
+            EventRegistrationListView,
+        ):
+            self.assertTrue(issubclass(view, ReplicaReadMixin), view)
+
+
+@REPLICAS
+class ReadYourWritesTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="runner",
+            password="test123",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        self.distance = Distance.objects.create(km=10)
+        self.event = Event.objects.create(
+            name="Kyiv Run",
+            start_datetime=datetime(2030, 5, 1, 9),
+            location="Kyiv",
+            event_type="Running",
+        )
+        self.event.distances.add(self.distance)
+        self.list_url = reverse(
+            "event:registration_list", kwargs={"pk": self.event.pk}
+        )
+
+    def test_registration_pins_client_to_primary(self) -> None:
+        # "replica_1" is not a configured connection, so only a pinned
+        # client can load the participant list.
+        with self.assertLogs("django.request", "ERROR"):
+            with self.assertRaises(ConnectionDoesNotExist):
+                self.client.get(self.list_url)
+        self.assertNotIn(PRIMARY_PIN_KEY, self.client.session)
+
+        self.client.post(
+            reverse(
+                "event:registration_create",
+                kwargs={"event_id": self.event.pk},
+            ),
+            {"distances": self.distance.pk},
+        )
+        self.assertIn(PRIMARY_PIN_KEY, self.client.session)
+        self.assertContains(self.client.get(self.list_url), "runner")
+
+    def test_failed_write_does_not_pin(self) -> None:
+        url = reverse("event:registration_create", kwargs={"event_id": 999})
+        self.client.post(url, {"distances": self.distance.pk})
+        self.assertNotIn(PRIMARY_PIN_KEY, self.client.session)
+
+    def test_pinned_client_skips_fragments_rendered_on_replica(self) -> None:
+        cache.clear()
+        index_url = reverse("event:index")
+        # A visitor served by a lagging replica caches the pre-write table.
+        request = RequestFactory().get(index_url)
+        request.user = self.user
+        with replica_reads():
+            key = get_fragment_key(request, "includes/event_table.html")
+        set_fragment(key, "stale replica table")
+
+        session = self.client.session
+        session[PRIMARY_PIN_KEY] = time.time() + 60
+        session.save()
+        response = self.client.get(index_url)
+        self.assertNotContains(response, "stale replica table")
+        self.assertContains(response, "Kyiv Run")
@@ -117,3 +117,78 @@ class PrivateRunnerDetailViewTests(TestCase):
     def test_runner_detail_view_context(self) -> None:
         response = self.client.get(self.runner_detail_url)
         self.assertEqual(response.context["runner"], self.runner)
+
+
+class RunnerDirectoryTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="viewer",
+            password="test123",
+            first_name="Viewer",
+            last_name="Zz",
+            date_of_birth="2000-01-01",
+        )
+        self.client.force_login(self.user)
+        for number, (last_name, first_name, city) in enumerate(
+            [
+                ("Shevchenko", "Olena", "Kyiv"),
+                ("Shevchuk", "Taras", "Lviv"),
+                ("Melnyk", "Olena", "Kyiv"),
+            ]
+        ):
+            Runner.objects.create(
+                username=f"runner{number}",
+                first_name=first_name,
+                last_name=last_name,
+                city=city,
+                date_of_birth="1990-01-01",
+                gender="Female",
+            )
+        Runner.objects.create(
+            username="admin", last_name="Admin", is_staff=True
+        )
+
+    def get_names(self, **params: str) -> list[str]:
+        res = self.client.get(RUNNER_URL, params)
+        return [runner.last_name for runner in res.context["runners"]]
+
+    def test_staff_filtered_in_queryset(self) -> None:
+        self.assertEqual(
+            self.get_names(), ["Melnyk", "Shevchenko", "Shevchuk", "Zz"]
+        )
+
+    def test_only_displayed_columns_loaded(self) -> None:
+        res = self.client.get(RUNNER_URL)
+        runner = res.context["runners"][0]
+        self.assertIn("password", runner.get_deferred_fields())
+        self.assertIn("email", runner.get_deferred_fields())
+
+    def test_search_by_name_prefix(self) -> None:
+        self.assertEqual(
+            self.get_names(name="shev"), ["Shevchenko", "Shevchuk"]
+        )
+        self.assertEqual(self.get_names(name="Shev tar"), ["Shevchuk"])
+
+    def test_search_by_city(self) -> None:
+        self.assertEqual(
+            self.get_names(city="kyiv"), ["Melnyk", "Shevchenko"]
+        )
+        self.assertEqual(self.get_names(name="mel", city="Lviv"), [])
+
+    def test_keyset_pages(self) -> None:
+        for number in range(60):
+            Runner.objects.create(
+                username=f"extra{number}",
+                last_name="Bondarenko",
+                first_name=f"Name{number:02}",
+            )
+        first = self.client.get(RUNNER_URL)
+        self.assertEqual(len(first.context["runners"]), 50)
+        second = self.client.get(
+            f"{RUNNER_URL}?{first.context['next_page_query']}"
+        )
+        names = [runner.last_name for runner in second.context["runners"]]
+        self.assertEqual(
+            names,
+            ["Bondarenko"] * 10 + ["Melnyk", "Shevchenko", "Shevchuk", "Zz"],
+        )
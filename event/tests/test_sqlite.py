@@ -0,0 +1,89 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from event.sqlite import optimize_sqlite
+
+SQLITE_ONLY = skipUnless(
+    connection.vendor == "sqlite", "Pragmas are SQLite specific"
+)
+
+
+def read_pragma(wrapper: object, name: str) -> object:
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@SQLITE_ONLY
+class SQLitePragmaTests(TestCase):
+    def test_connection_uses_configured_pragmas(self) -> None:
+        self.assertEqual(read_pragma(connection, "synchronous"), 1)
+        self.assertEqual(
+            read_pragma(connection, "busy_timeout"),
+            settings.SQLITE_PRAGMAS["busy_timeout"],
+        )
+        self.assertEqual(
+            read_pragma(connection, "cache_size"),
+            settings.SQLITE_PRAGMAS["cache_size"],
+        )
+
+    def test_new_connections_read_pragmas_from_settings(self) -> None:
+        with override_settings(SQLITE_PRAGMAS={"cache_size": -1234}):
+            wrapper = connection.copy()
+            try:
+                self.assertEqual(read_pragma(wrapper, "cache_size"), -1234)
+            finally:
+                wrapper.close()
+
+    def test_file_databases_use_wal(self) -> None:
+        # In-memory databases always report "memory", so check a file.
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = connection.copy()
+            wrapper.settings_dict["NAME"] = Path(directory) / "wal.sqlite3"
+            try:
+                self.assertEqual(read_pragma(wrapper, "journal_mode"), "wal")
+            finally:
+                wrapper.close()
+
+    def test_optimize_waits_for_transactions(self) -> None:
+        connection.optimized_at = time.monotonic() - 3600
+        with CaptureQueriesContext(connection) as context:
+            optimize_sqlite()
+        self.assertEqual(context.captured_queries, [])
+
+
+@SQLITE_ONLY
+class SQLiteOptimizeTests(TransactionTestCase):
+    def optimize(self) -> list[str]:
+        with CaptureQueriesContext(connection) as context:
+            optimize_sqlite()
+        return [query["sql"] for query in context.captured_queries]
+
+    def test_optimize_runs_once_per_interval(self) -> None:
+        connection.ensure_connection()
+        connection.optimized_at = time.monotonic() - 3600
+        self.assertEqual(self.optimize(), ["PRAGMA optimize"])
+        self.assertEqual(self.optimize(), [])
+
+    def test_connection_outlives_the_request(self) -> None:
+        # Reconnecting would run every SQLITE_PRAGMAS statement again.
+        connection.ensure_connection()
+        database = connection.connection
+        close_old_connections()
+        self.assertIs(connection.connection, database)
+
+    @override_settings(SQLITE_OPTIMIZE_INTERVAL=0)
+    def test_request_runs_optimize(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/accounts/login/")
+        self.assertIn(
+            "PRAGMA optimize",
+            [query["sql"] for query in context.captured_queries],
+        )
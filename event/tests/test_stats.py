@@ -0,0 +1,149 @@
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from event.models import Distance, Event, Registration, Runner, RunnerStats
+from event.stats import rebuild_runner_stats
+
+THIS_YEAR = datetime.today().year
+
+
+class RunnerStatsTests(TestCase):
+    def setUp(self) -> None:
+        self.runner = Runner.objects.create(
+            username="runner",
+            first_name="Test",
+            last_name="Runner",
+            date_of_birth="2000-01-01",
+        )
+        self.five = Distance.objects.create(km=5)
+        self.ten = Distance.objects.create(km=10)
+        self.spring = self.create_event("Spring Run", THIS_YEAR, "Running")
+        self.autumn = self.create_event("Autumn Ride", THIS_YEAR, "Cycling")
+        self.classic = self.create_event("Classic", THIS_YEAR - 3, "Running")
+
+    def create_event(self, name: str, year: int, event_type: str) -> Event:
+        month = {"Spring Run": 4, "Autumn Ride": 10}.get(name, 6)
+        return Event.objects.create(
+            name=name,
+            start_datetime=datetime(year, month, 1, 9),
+            location="Kyiv",
+            description="Test Description",
+            event_type=event_type,
+            organiser="New Run",
+        )
+
+    def register(self, event: Event, distance: Distance) -> Registration:
+        return Registration.objects.create(
+            event=event, runner=self.runner, distances=distance
+        )
+
+    def stats(self) -> tuple:
+        stats = RunnerStats.objects.get(runner=self.runner)
+        return (
+            stats.total_events,
+            stats.km_by_type,
+            stats.events_this_year,
+            stats.first_event,
+            stats.last_event,
+        )
+
+    def assert_matches_rebuild(self) -> None:
+        incremental = self.stats()
+        rebuild_runner_stats([self.runner.pk])
+        self.assertEqual(incremental, self.stats())
+
+    def test_registrations_are_counted(self) -> None:
+        self.register(self.spring, self.ten)
+        self.register(self.autumn, self.ten)
+        self.register(self.classic, self.five)
+        self.assertEqual(
+            self.stats(),
+            (
+                3,
+                {"Running": 15, "Cycling": 10},
+                2,
+                self.classic,
+                self.autumn,
+            ),
+        )
+        self.assert_matches_rebuild()
+
+    def test_distance_from_another_worker_is_loaded(self) -> None:
+        # Another worker's version bump never reaches a per-process cache.
+        Distance.objects.get_map()
+        version = Distance.objects.snapshot[0]
+        with mock.patch(
+            "event.models.get_distances_version", return_value=version
+        ):
+            marathon = Distance.objects.create(km=42)
+            self.register(self.spring, marathon)
+        self.assertEqual(self.stats()[1], {"Running": 42})
+
+    def test_changed_registration_moves_the_totals(self) -> None:
+        self.register(self.spring, self.ten)
+        registration = self.register(self.classic, self.five)
+        registration.event = self.autumn
+        registration.save()
+        self.assertEqual(
+            self.stats(),
+            (2, {"Running": 10, "Cycling": 5}, 2, self.spring, self.autumn),
+        )
+        self.assert_matches_rebuild()
+
+    def test_changed_distance_keeps_the_bounds(self) -> None:
+        registration = self.register(self.spring, self.five)
+        registration.distances = self.ten
+        registration.save()
+        self.assertEqual(
+            self.stats(), (1, {"Running": 10}, 1, self.spring, self.spring)
+        )
+        self.assert_matches_rebuild()
+
+    def test_cancelled_registration_is_uncounted(self) -> None:
+        self.register(self.spring, self.ten)
+        self.register(self.autumn, self.ten).delete()
+        self.assertEqual(
+            self.stats(), (1, {"Running": 10}, 1, self.spring, self.spring)
+        )
+        self.assert_matches_rebuild()
+
+    def test_deleted_event_is_uncounted(self) -> None:
+        self.register(self.spring, self.ten)
+        self.register(self.classic, self.five)
+        self.classic.delete()
+        self.assertEqual(
+            self.stats(), (1, {"Running": 10}, 1, self.spring, self.spring)
+        )
+
+    def test_rescheduled_event_is_recounted(self) -> None:
+        self.register(self.spring, self.ten)
+        self.register(self.classic, self.five)
+        self.classic.start_datetime = datetime(THIS_YEAR, 12, 1, 9)
+        self.classic.save()
+        self.assertEqual(
+            self.stats(), (2, {"Running": 15}, 2, self.spring, self.classic)
+        )
+
+    def test_refresh_command_recounts_everyone(self) -> None:
+        self.register(self.spring, self.ten)
+        RunnerStats.objects.all().delete()
+        out = StringIO()
+        call_command("refresh_runner_stats", stdout=out)
+        self.assertIn("Summarised 1 runner(s).", out.getvalue())
+        self.assertEqual(self.stats()[0], 1)
+
+    def test_runner_detail_loads_history_in_one_query(self) -> None:
+        for event in (self.spring, self.autumn, self.classic):
+            self.register(event, self.ten)
+        self.client.force_login(self.runner)
+        url = reverse("event:runner_detail", kwargs={"pk": self.runner.pk})
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.context["stats"].total_events, 3)
+        self.assertContains(response, "Cycling: 10 км")
+        self.assertContains(response, "Classic")
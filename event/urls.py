@@ -1,6 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
+from event.api import (
+    EventDetailAPIView,
+    EventDistancesAPIView,
+    EventListAPIView,
+)
 from event.views import (
+    AsyncArchiveListView,
+    AsyncEventDetailView,
+    AsyncEventListView,
     EventListView,
     EventDetailView,
     EventCreateView,
@@ -11,6 +20,8 @@ from event.views import (
     RunnerUpdateView,
     RunnerDeleteView,
     EventRegistrationListView,
+    EventRegistrationExportView,
+    EventLeaderboardView,
     RegistrationCreateView,
     RegistrationUpdateView,
     MyRegistrationsView,
@@ -21,11 +32,20 @@ from event.views import (
 
 app_name = "event"
 
+if settings.ASYNC_EVENT_VIEWS:
+    event_list_view = AsyncEventListView.as_view()
+    event_detail_view = AsyncEventDetailView.as_view()
+    archive_list_view = AsyncArchiveListView.as_view()
+else:
+    event_list_view = EventListView.as_view()
+    event_detail_view = EventDetailView.as_view()
+    archive_list_view = ArchiveListView.as_view()
+
 urlpatterns = [
-    path("", EventListView.as_view(), name="index"),
+    path("", event_list_view, name="index"),
     path(
         "events/<int:pk>/detail",
-        EventDetailView.as_view(),
+        event_detail_view,
         name="event_detail"
     ),
     path("events/create", EventCreateView.as_view(), name="event_create"),
@@ -61,6 +81,16 @@ urlpatterns = [
         EventRegistrationListView.as_view(),
         name="registration_list",
     ),
+    path(
+        "events/<int:pk>/registrations/export.<str:export_format>",
+        EventRegistrationExportView.as_view(),
+        name="registration_export",
+    ),
+    path(
+        "events/<int:pk>/leaderboard/",
+        EventLeaderboardView.as_view(),
+        name="leaderboard",
+    ),
     path(
         "my-registrations/",
         MyRegistrationsView.as_view(),
@@ -93,7 +123,18 @@ urlpatterns = [
     ),
     path(
         "archive/",
-        ArchiveListView.as_view(),
+        archive_list_view,
         name="archive_list",
     ),
+    path("api/events/", EventListAPIView.as_view(), name="api_event_list"),
+    path(
+        "api/events/<int:pk>/",
+        EventDetailAPIView.as_view(),
+        name="api_event_detail",
+    ),
+    path(
+        "api/events/<int:pk>/distances/",
+        EventDistancesAPIView.as_view(),
+        name="api_event_distances",
+    ),
 ]
@@ -1,28 +1,61 @@
+import csv
+import json
+from collections.abc import Iterator
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError
+from django.db.models import Count
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
 from django.utils import timezone
 from django.views import generic
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import update_session_auth_hash
 
+from event.cache import AsyncFragmentCacheMixin, FragmentCacheMixin
 from event.forms import (
     RunnerCreationForm,
     RunnerUpdateForm,
     EventCreationForm,
     EventSearchForm,
     RegistrationForm,
+    RunnerSearchForm,
 )
-from event.models import Event, Runner, Registration, Distance
+from event.models import (
+    Event,
+    Leaderboard,
+    LeaderboardEntry,
+    Registration,
+    Runner,
+)
+from event.identity import get_event, get_identity_map
+from event.pagination import KeysetPaginationMixin
+from event.routers import ReplicaReadMixin
+from event.search import search_events, search_runners
 from django.urls import reverse_lazy, reverse
 
 
-class BaseEventListView(LoginRequiredMixin, generic.ListView):
+class BaseEventListView(
+    FragmentCacheMixin,
+    KeysetPaginationMixin,
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    generic.ListView,
+):
     model = Event
     context_object_name = "events"
     paginate_by = 7
+    segment = None
 
     def get_queryset(self) -> None:
-        queryset = Event.objects.all()
+        queryset = Event.objects.with_cached_distances()
         is_active = self.get_is_active()
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active)
@@ -32,79 +65,55 @@ class BaseEventListView(LoginRequiredMixin, generic.ListView):
             queryset = queryset.filter(event_type=event_type)
 
         form = EventSearchForm(self.request.GET)
+        self.is_search = form.is_valid() and any(form.cleaned_data.values())
         if form.is_valid():
-            name = form.cleaned_data.get("name", "")
-            location = form.cleaned_data.get("location", "")
-            if name:
-                queryset = queryset.filter(name__icontains=name)
-            if location:
-                queryset = queryset.filter(location__icontains=location)
+            queryset = search_events(
+                queryset,
+                name=form.cleaned_data.get("name", ""),
+                location=form.cleaned_data.get("location", ""),
+            )
         return queryset
 
     def get_context_data(self, **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
         context["search_form"] = EventSearchForm(self.request.GET)
-        context["distances"] = Distance.objects.all()
-        for event in context["events"]:
-            event.registration_count = event.registrations.count()
+        context["segment"] = self.segment
+        return context
+
+    def get_page_context_data(self, **kwargs: dict) -> dict:
+        context = super().get_page_context_data(**kwargs)
+        context["search_form"] = EventSearchForm(self.request.GET)
+        context["segment"] = self.segment
         return context
 
     def get_is_active(self) -> None:
         return True
 
+    def use_keyset_pagination(self) -> bool:
+        return not self.is_search
+
 
 class EventListView(BaseEventListView):
     template_name = "event/index.html"
+    fragment_template_name = "includes/event_table.html"
+    segment = "events"
 
     def get_queryset(self) -> None:
         queryset = super().get_queryset()
-        event_type = self.request.GET.get("event_type")
-        if event_type:
-            queryset = queryset.filter(event_type=event_type)
         return queryset.filter(
             start_datetime__gt=timezone.now(),
             is_active=True
         )
 
-    def get_context_data(self, **kwargs: dict) -> dict:
-        context = super().get_context_data(**kwargs)
-        context["segment"] = "events"
-        return context
-
 
 class ArchiveListView(BaseEventListView):
     template_name = "event/archive_list.html"
+    fragment_template_name = "includes/archive_table.html"
+    segment = "archive"
 
     def get_is_active(self) -> None:
         return False
 
-    from django.utils import timezone
-
-    class ArchiveListView(BaseEventListView):
-        template_name = "event/archive_list.html"
-
-        def get_queryset(self) -> None:
-            queryset = super().get_queryset()
-            queryset.filter(
-                start_datetime__lte=timezone.now(),
-                is_active=True
-            ).update(is_active=False)
-            queryset.filter(
-                start_datetime__gt=timezone.now(),
-                is_active=False
-            ).update(is_active=True)
-            return queryset.filter(is_active=False)
-
-        def get_context_data(self, **kwargs: dict) -> dict:
-            context = super().get_context_data(**kwargs)
-            context["segment"] = "archive"
-            return context
-
-    def get_context_data(self, **kwargs: dict) -> dict:
-        context = super().get_context_data(**kwargs)
-        context["segment"] = "archive"
-        return context
-
 
 class EventDetailView(LoginRequiredMixin, generic.DetailView):
     model = Event
@@ -114,9 +123,53 @@ class EventDetailView(LoginRequiredMixin, generic.DetailView):
     def get_context_data(self, **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
         context["runner"] = self.request.user
+        context["distance_counters"] = self.object.distance_counters.filter(
+            registration_count__gt=0
+        ).select_related("distance").order_by("distance__km")
         return context
 
 
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    async def dispatch(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        is_authenticated = await sync_to_async(
+            lambda: request.user.is_authenticated
+        )()
+        if not is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(
+            request, *args, **kwargs
+        )
+
+
+class AsyncEventListView(
+    AsyncFragmentCacheMixin, AsyncLoginRequiredMixin, EventListView
+):
+    pass
+
+
+class AsyncArchiveListView(
+    AsyncFragmentCacheMixin, AsyncLoginRequiredMixin, ArchiveListView
+):
+    pass
+
+
+class AsyncEventDetailView(AsyncLoginRequiredMixin, EventDetailView):
+    async def get(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        try:
+            self.object = await self.get_queryset().aget(pk=kwargs["pk"])
+        except Event.DoesNotExist:
+            raise Http404("No event found matching the query")
+        context = self.get_context_data(object=self.object)
+        context["distance_counters"] = [
+            counter async for counter in context["distance_counters"]
+        ]
+        return self.render_to_response(context)
+
+
 class EventCreateView(LoginRequiredMixin, generic.CreateView):
     model = Event
     form_class = EventCreationForm
@@ -130,6 +183,9 @@ class EventUpdateView(LoginRequiredMixin, generic.UpdateView):
     template_name = "event/event_form.html"
     success_url = reverse_lazy("event:index")
 
+    def get_queryset(self) -> Event:
+        return Event.objects.with_cached_distances()
+
 
 class EventDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Event
@@ -137,23 +193,62 @@ class EventDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("event:index")
 
 
-class RunnerListView(LoginRequiredMixin, generic.ListView):
+class RunnerListView(
+    KeysetPaginationMixin,
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    generic.ListView,
+):
     model = Runner
     context_object_name = "runners"
     template_name = "event/runner_list.html"
-    ordering = ["last_name", "first_name"]
+    paginate_by = 50
+    cursor_ordering = ("last_name", "first_name", "id")
+    list_fields = (
+        "id",
+        "username",
+        "first_name",
+        "last_name",
+        "gender",
+        "date_of_birth",
+    )
+
+    def get_queryset(self) -> Runner:
+        queryset = Runner.objects.filter(is_staff=False).only(
+            *self.list_fields
+        )
+        form = RunnerSearchForm(self.request.GET)
+        if form.is_valid():
+            queryset = search_runners(queryset, **form.cleaned_data)
+        return queryset
+
+    def get_context_data(self, **kwargs: dict) -> dict:
+        context = super().get_context_data(**kwargs)
+        context["search_form"] = RunnerSearchForm(self.request.GET)
+        return context
 
 
-class RunnerDetailView(LoginRequiredMixin, generic.DetailView):
+class RunnerDetailView(
+    LoginRequiredMixin, ReplicaReadMixin, generic.DetailView
+):
     model = Runner
     context_object_name = "runner"
     template_name = "event/runner_detail.html"
 
+    def get_queryset(self) -> Runner:
+        return Runner.objects.select_related(
+            "stats__first_event", "stats__last_event"
+        )
+
     def get_context_data(self, **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
-        runner = self.get_object()
-        context["registrations"] = Registration.objects.filter(
-            runner=runner).order_by("event__start_datetime")
+        runner = self.object
+        context["stats"] = getattr(runner, "stats", None)
+        context["registrations"] = (
+            Registration.objects.filter(runner=runner)
+            .select_related("event", "distances")
+            .order_by("event__start_datetime")
+        )
         return context
 
 
@@ -185,20 +280,30 @@ class RunnerDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("event:index")
 
 
-class EventRegistrationListView(LoginRequiredMixin, generic.ListView):
+class EventRegistrationListView(
+    LoginRequiredMixin, ReplicaReadMixin, generic.ListView
+):
     model = Registration
     template_name = "event/registration_list.html"
     context_object_name = "registrations"
 
     def get_queryset(self) -> Registration:
         event_id = self.kwargs["pk"]
-        return Registration.objects.filter(
-            event_id=event_id).order_by("distances")
+        queryset = (
+            Registration.objects.filter(event_id=event_id)
+            .select_related("runner", "distances")
+            .with_age()
+            .order_by("distances")
+        )
+        category = self.request.GET.get("category")
+        if category:
+            queryset = queryset.filter(age_category=category)
+        return queryset
 
     def get_context_data(self, **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
         event_id = self.kwargs["pk"]
-        event = Event.objects.get(pk=event_id)
+        event = Event.objects.with_cached_distances().get(pk=event_id)
 
         context.update(
             {
@@ -208,11 +313,125 @@ class EventRegistrationListView(LoginRequiredMixin, generic.ListView):
                 "event_location": event.location,
                 "distances": event.get_distances(),
                 "organiser": event.organiser,
+                "registration_count": event.registration_count,
+                "distance_counters": event.distance_counters.filter(
+                    registration_count__gt=0
+                ).select_related("distance").order_by("distance__km"),
+                "age_categories": Registration.objects.filter(
+                    event_id=event_id
+                ).with_age().values("age_category").annotate(
+                    total=Count("id")
+                ).order_by("age_category"),
+                "category": self.request.GET.get("category", ""),
             }
         )
         return context
 
 
+class Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+class EventRegistrationExportView(LoginRequiredMixin, generic.View):
+    chunk_size = 2000
+    fields = (
+        ("distance_km", "distances__km"),
+        ("last_name", "runner__last_name"),
+        ("first_name", "runner__first_name"),
+        ("username", "runner__username"),
+        ("gender", "runner__gender"),
+        ("date_of_birth", "runner__date_of_birth"),
+        ("city", "runner__city"),
+        ("age", "age"),
+        ("age_category", "age_category"),
+        ("registration_date", "registration_date"),
+    )
+
+    def get(
+        self, request: HttpRequest, pk: int, export_format: str
+    ) -> StreamingHttpResponse:
+        if export_format not in ("csv", "jsonl"):
+            raise Http404("Unknown export format")
+        get_object_or_404(Event.objects.only("id"), pk=pk)
+        rows = (
+            Registration.objects.filter(event_id=pk)
+            .with_age()
+            .order_by("distances", "id")
+            .values_list(*(lookup for _, lookup in self.fields))
+            .iterator(chunk_size=self.chunk_size)
+        )
+        if export_format == "csv":
+            content = self.stream_csv(rows)
+            content_type = "text/csv"
+        else:
+            content = self.stream_jsonl(rows)
+            content_type = "application/jsonl"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="event-{pk}-registrations.{export_format}"'
+        )
+        return response
+
+    def stream_csv(self, rows: Iterator[tuple]) -> Iterator[str]:
+        writer = csv.writer(Echo())
+        yield writer.writerow([name for name, _ in self.fields])
+        for row in rows:
+            yield writer.writerow(row)
+
+    def stream_jsonl(self, rows: Iterator[tuple]) -> Iterator[str]:
+        names = [name for name, _ in self.fields]
+        for row in rows:
+            yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder)
+            yield "\n"
+
+
+class EventLeaderboardView(
+    KeysetPaginationMixin,
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    generic.ListView,
+):
+    model = LeaderboardEntry
+    context_object_name = "entries"
+    template_name = "event/leaderboard.html"
+    paginate_by = 50
+    cursor_ordering = ("net_time", "id")
+
+    def get_boards(self) -> Leaderboard:
+        return (
+            Leaderboard.objects.filter(event_id=self.kwargs["pk"], size__gt=0)
+            .select_related("distance")
+            .order_by("distance__km", "gender", "age_category")
+        )
+
+    def get_queryset(self) -> LeaderboardEntry:
+        self.event = get_object_or_404(Event, pk=self.kwargs["pk"])
+        self.boards = list(self.get_boards())
+        self.leaderboard = None
+        distance = self.request.GET.get("distance", "")
+        gender = self.request.GET.get("gender", "")
+        category = self.request.GET.get("category", "")
+        for board in self.boards:
+            if distance and str(board.distance_id) != distance:
+                continue
+            if (board.gender, board.age_category) == (gender, category):
+                self.leaderboard = board
+                break
+        if self.leaderboard is None:
+            return LeaderboardEntry.objects.none()
+        return LeaderboardEntry.objects.filter(
+            leaderboard=self.leaderboard
+        ).select_related("registration__runner")
+
+    def get_context_data(self, **kwargs: dict) -> dict:
+        context = super().get_context_data(**kwargs)
+        context["event"] = self.event
+        context["boards"] = self.boards
+        context["leaderboard"] = self.leaderboard
+        return context
+
+
 class MyRegistrationsView(LoginRequiredMixin, generic.ListView):
     model = Registration
     context_object_name = "registrations"
@@ -238,20 +457,26 @@ class RegistrationCreateView(LoginRequiredMixin, generic.CreateView):
 
     def get_form_kwargs(self) -> dict:
         kwargs = super().get_form_kwargs()
-        kwargs["event_id"] = self.kwargs["event_id"]
+        kwargs["event"] = get_event(self.request, self.kwargs["event_id"])
         return kwargs
 
     def form_valid(self, form: EventCreationForm) -> HttpResponse:
-        event = get_object_or_404(Event, id=self.kwargs["event_id"])
-        runner = self.request.user
-
-        if Registration.objects.filter(event=event, runner=runner).exists():
+        form.instance.event = get_event(self.request, self.kwargs["event_id"])
+        form.instance.runner = self.request.user
+        try:
+            return super().form_valid(form)
+        except IntegrityError:
+            # Only the unique (event, runner) constraint is the runner's
+            # doing; anything else is a real error.
+            if not Registration.objects.filter(
+                event=form.instance.event, runner=form.instance.runner
+            ).exists():
+                raise
             form.add_error(None, "You are already registered for this event.")
             return self.form_invalid(form)
-
-        form.instance.event = event
-        form.instance.runner = runner
-        return super().form_valid(form)
+        except ValidationError as error:
+            form.add_error("distances", error)
+            return self.form_invalid(form)
 
     def get_success_url(self) -> str:
         return reverse_lazy("event:my_registrations_list")
@@ -262,12 +487,30 @@ class RegistrationUpdateView(LoginRequiredMixin, generic.UpdateView):
     form_class = RegistrationForm
     template_name = "event/registration_form.html"
 
+    def get_object(self, queryset: Registration = None) -> Registration:
+        if queryset is None:
+            queryset = self.get_queryset()
+        try:
+            registration = get_identity_map(self.request).get(
+                queryset, self.kwargs["pk"]
+            )
+        except Registration.DoesNotExist:
+            raise Http404("No registration found matching the query")
+        registration.event = get_event(self.request, registration.event_id)
+        return registration
+
     def get_form_kwargs(self) -> dict:
         kwargs = super().get_form_kwargs()
-        registration = self.get_object()
-        kwargs["event_id"] = registration.event.id
+        kwargs["event"] = self.object.event
         return kwargs
 
+    def form_valid(self, form: RegistrationForm) -> HttpResponse:
+        try:
+            return super().form_valid(form)
+        except ValidationError as error:
+            form.add_error("distances", error)
+            return self.form_invalid(form)
+
     def get_success_url(self) -> str:
         return reverse_lazy("event:my_registrations_list")
 
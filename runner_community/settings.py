@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import os
+import sys
+
 import dj_database_url
 
 from dotenv import load_dotenv
@@ -40,6 +42,18 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Behind a reverse proxy every request comes from 127.0.0.1, so /metrics
+# does not trust INTERNAL_IPS. Scrapers send METRICS_TOKEN as a bearer
+# token or come from METRICS_ALLOWED_IPS (comma separated, empty by default).
+METRICS_ALLOWED_IPS = list(
+    filter(None, os.environ.get("METRICS_ALLOWED_IPS", "").split(","))
+)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# The toolbar instruments every request, so it is only enabled for local
+# development and never under the test runner.
+ENABLE_DEBUG_TOOLBAR = DEBUG and "test" not in sys.argv[1:2]
+
 
 # Application definition
 
@@ -50,26 +64,34 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "crispy_forms",
     "crispy_bootstrap4",
     "event",
 ]
 
 MIDDLEWARE = [
+    "event.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "event.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "event.middleware.PrimaryPinMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if ENABLE_DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "runner_community.urls"
 
+# Serve the event list, archive and detail pages from async views; only
+# useful when running under an ASGI server (see README).
+ASYNC_EVENT_VIEWS = os.environ.get("ASYNC_EVENT_VIEWS") == "1"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -97,12 +119,80 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Keep connections across requests, as DATABASE_URL ones are, so the
+        # SQLITE_PRAGMAS below run once per connection, not per request.
+        "CONN_MAX_AGE": 500,
     }
 }
 
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
+# Tests run threads against the database (see the concurrent registration
+# tests), which SQLite's shared in-memory database cannot serve.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db.sqlite3"}
+
+# Applied to every new SQLite connection by event.sqlite. WAL lets readers
+# run alongside the writer, and busy_timeout makes a second writer wait for
+# the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "busy_timeout": 20_000,
+    # Durable in WAL mode except for the last commits on power loss.
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative sizes are in KiB: 64 MB of page cache per connection.
+    "cache_size": -64 * 1024,
+    # Bounds the rows ANALYZE samples per index when PRAGMA optimize runs.
+    "analysis_limit": 1000,
+}
+SQLITE_OPTIMIZE_INTERVAL = 3600
+
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgres://replica1/db,...
+# Only views using event.routers.ReplicaReadMixin read from them; a client
+# that has just written reads from the primary for REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for number, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")),
+    start=1,
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = dj_database_url.parse(url.strip(), conn_max_age=500)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["event.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = 10
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The event list fragment cache keeps its generation counter here, so every
+# worker must share one backend (set REDIS_URL in production).
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+EVENT_LIST_CACHE_TIMEOUT = 300
+# Each worker keeps its own copy of the distances table. It is reloaded when
+# the version in the shared cache moves; with the per-process LocMemCache
+# other workers only pick changes up after this many seconds.
+DISTANCES_SNAPSHOT_MAX_AGE = 60
+# The signed-in runner row and sidebar flags, cleared on profile and
+# registration changes.
+USER_CONTEXT_CACHE_TIMEOUT = 300
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -126,6 +216,11 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = "event.Runner"
+AUTHENTICATION_BACKENDS = [
+    "event.backends.CachedModelBackend",
+    # Sessions started before the cached backend still name this one.
+    "django.contrib.auth.backends.ModelBackend",
+]
 LOGIN_REDIRECT_URL = "/"
 
 # Internationalization